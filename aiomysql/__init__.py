@@ -30,8 +30,11 @@ from pymysql.err import (Warning, Error, InterfaceError, DataError,
                          NotSupportedError, ProgrammingError, MySQLError)
 
 from .connection import Connection, connect
-from .cursors import Cursor, SSCursor, DictCursor, SSDictCursor
+from .cursors import (Cursor, SSCursor, DictCursor, SSDictCursor,
+                      NamedTupleCursor, SSNamedTupleCursor, ColumnarCursor,
+                      LazyRowCursor, PreparedCursor, SSPreparedCursor)
 from .pool import create_pool, Pool
+from .groupcommit import GroupCommitter
 
 __version__ = '0.0.9'
 
@@ -61,8 +64,17 @@ __all__ = [
     'Cursor',
     'SSCursor',
     'DictCursor',
-    'SSDictCursor'
+    'SSDictCursor',
+    'NamedTupleCursor',
+    'SSNamedTupleCursor',
+    'ColumnarCursor',
+    'LazyRowCursor',
+    'PreparedCursor',
+    'SSPreparedCursor',
+    'GroupCommitter',
 ]
 
 (Connection, Pool, connect, create_pool, Cursor, SSCursor, DictCursor,
- SSDictCursor)  # pyflakes
+ SSDictCursor, NamedTupleCursor, SSNamedTupleCursor, ColumnarCursor,
+ LazyRowCursor, PreparedCursor, SSPreparedCursor,
+ GroupCommitter)  # pyflakes
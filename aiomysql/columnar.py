@@ -0,0 +1,288 @@
+from array import array
+
+from pymysql.constants import FIELD_TYPE, FLAG
+
+
+# array typecodes for integer columns, (signed, unsigned)
+_INT_TYPECODES = {
+    FIELD_TYPE.TINY: ('b', 'B'),
+    FIELD_TYPE.SHORT: ('h', 'H'),
+    FIELD_TYPE.INT24: ('i', 'I'),
+    FIELD_TYPE.LONG: ('i', 'I'),
+    FIELD_TYPE.LONGLONG: ('q', 'Q'),
+    FIELD_TYPE.YEAR: ('H', 'H'),
+}
+
+# numpy dtypes of columns decoded into lists
+_NUMPY_DTYPES = {
+    FIELD_TYPE.DATETIME: 'datetime64[us]',
+    FIELD_TYPE.TIMESTAMP: 'datetime64[us]',
+    FIELD_TYPE.DATE: 'datetime64[D]',
+    FIELD_TYPE.NEWDATE: 'datetime64[D]',
+    FIELD_TYPE.TIME: 'timedelta64[us]',
+}
+
+_INT, _FLOAT, _BLOB, _OBJECT = range(4)
+
+
+class BlobColumn(object):
+    """Binary column values packed into one buffer.
+
+    ``offsets[i]:offsets[i + 1]`` is the slice of ``data`` holding the value
+    of row ``i``.
+    """
+
+    __slots__ = ('data', 'offsets')
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('Q', [0])
+
+    def append(self, value):
+        self.data += value
+        self.offsets.append(len(self.data))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        offsets = self.offsets
+        return bytes(self.data[offsets[index]:offsets[index + 1]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class ColumnarRows(object):
+    """Read-only sequence of result rows stored column by column.
+
+    Row tuples are only built when indexed, ``columns`` holds one container
+    per column and ``null_masks`` a ``bytearray`` per column with ``1`` for
+    NULL rows, or ``None`` if the column has no NULL values.
+    """
+
+    __slots__ = ('columns', 'null_masks', '_length')
+
+    def __init__(self, columns, null_masks, length):
+        self.columns = columns
+        self.null_masks = null_masks
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i)
+                    for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._row(i)
+
+    def _row(self, index):
+        return tuple(None if mask is not None and mask[index]
+                     else column[index]
+                     for column, mask in zip(self.columns, self.null_masks))
+
+
+_NOT_IMPORTED = object()
+_numpy = _NOT_IMPORTED
+
+
+def _import_numpy():
+    """Return numpy or ``None`` if it is not installed, it is imported on
+    first use rather than with aiomysql"""
+    global _numpy
+    if _numpy is _NOT_IMPORTED:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+class ColumnarBuilder(object):
+    """Decode row data packets of a result straight into column containers.
+
+    Integer and float columns go to :class:`array.array`, binary columns to
+    :class:`BlobColumn` and everything else to lists of converted values.
+    When NumPy is installed numbers are collected as text and parsed in
+    bulk by :func:`numpy.fromstring` every ``parse_chunk_rows`` rows,
+    otherwise each value is parsed when its row is added.
+    """
+
+    parse_chunk_rows = 65536
+
+    def __init__(self, result):
+        self._numpy = _import_numpy()
+        self._columns = []
+        for field, (encoding, converter) in zip(result.fields,
+                                                result.converters):
+            if converter is int and field.type_code in _INT_TYPECODES:
+                typecodes = _INT_TYPECODES[field.type_code]
+                unsigned = bool(field.flags & FLAG.UNSIGNED)
+                kind, values = _INT, array(typecodes[unsigned])
+            elif converter is float:
+                kind, values = _FLOAT, array('d')
+            elif encoding is None and converter is None:
+                kind, values = _BLOB, BlobColumn()
+            else:
+                kind, values = _OBJECT, []
+            if self._numpy is not None and kind in (_INT, _FLOAT):
+                raw = bytearray()
+            else:
+                raw = None
+            self._columns.append([kind, values, encoding, converter, [], raw])
+        self._count = 0
+
+    def add_row(self, packet):
+        read = packet.read_length_coded_string
+        for column in self._columns:
+            kind, values, encoding, converter, nulls, raw = column
+            data = read()
+            if raw is not None:
+                if data is None:
+                    nulls.append(self._count)
+                    data = b'0'
+                raw += data
+                raw += b' '
+            elif data is None:
+                nulls.append(self._count)
+                if kind == _BLOB:
+                    values.append(b'')
+                elif kind == _OBJECT:
+                    values.append(None)
+                else:
+                    values.append(0)
+            elif kind == _INT:
+                try:
+                    values.append(int(data))
+                except OverflowError:
+                    # value does not fit the declared type, keep ints as list
+                    self._to_list(column, [int(data)])
+            elif kind == _FLOAT:
+                values.append(float(data))
+            elif kind == _BLOB:
+                values.append(data)
+            else:
+                if encoding is not None:
+                    data = data.decode(encoding)
+                if converter is not None:
+                    data = converter(data)
+                values.append(data)
+        self._count += 1
+        if self._numpy is not None and \
+                not self._count % self.parse_chunk_rows:
+            self._parse_numbers()
+
+    def _to_list(self, column, parsed):
+        values = column[1].tolist() + parsed
+        for i in column[4]:
+            values[i] = None
+        column[0], column[1], column[5] = _OBJECT, values, None
+
+    def _parse_numbers(self):
+        numpy = self._numpy
+        for column in self._columns:
+            kind, values, encoding, converter, nulls, raw = column
+            if not raw:
+                continue
+            text = bytes(raw)
+            if kind == _FLOAT:
+                parsed = numpy.fromstring(text, dtype=numpy.float64, sep=' ')
+            else:
+                # parse as 64 bit and check the values fit the column
+                wide = numpy.fromstring(
+                    text, sep=' ',
+                    dtype='Q' if values.typecode.isupper() else 'q')
+                parsed = wide.astype(values.typecode)
+                if (parsed != wide).any():
+                    self._to_list(column, list(map(int, text.split())))
+                    continue
+            del raw[:]
+            values.frombytes(parsed.tobytes())
+
+    def finish(self):
+        if self._numpy is not None:
+            self._parse_numbers()
+        columns = []
+        null_masks = []
+        for kind, values, encoding, converter, nulls, raw in self._columns:
+            columns.append(values)
+            if nulls:
+                mask = bytearray(self._count)
+                for i in nulls:
+                    mask[i] = 1
+                null_masks.append(mask)
+            else:
+                null_masks.append(None)
+        return ColumnarRows(tuple(columns), tuple(null_masks), self._count)
+
+
+def to_numpy(fields, rows):
+    """Convert columns of :class:`ColumnarRows` into numpy arrays.
+
+    Returns a list with one array per column, arrays of columns holding
+    NULL values are :class:`numpy.ma.MaskedArray`.
+    """
+    import numpy
+
+    arrays = []
+    for field, column, mask in zip(fields, rows.columns, rows.null_masks):
+        if isinstance(column, array):
+            values = numpy.frombuffer(column, dtype=column.typecode)
+            if field.type_code == FIELD_TYPE.FLOAT:
+                values = values.astype(numpy.float32)
+        else:
+            values = _numpy_objects(numpy, field, column)
+        if mask is not None:
+            values = numpy.ma.MaskedArray(
+                values, mask=numpy.frombuffer(mask, dtype=numpy.bool_))
+        arrays.append(values)
+    return arrays
+
+
+def _numpy_objects(numpy, field, column):
+    dtype = _NUMPY_DTYPES.get(field.type_code)
+    if dtype is None:
+        values = numpy.empty(len(column), dtype=object)
+        values[:] = column if isinstance(column, list) else list(column)
+        return values
+    try:
+        return numpy.array(column, dtype=dtype)
+    except (TypeError, ValueError):
+        # zero dates are returned as strings, store them as NaT
+        return numpy.array([v if not isinstance(v, (str, bytes)) else None
+                            for v in column], dtype=dtype)
+
+
+def to_structured(names, arrays):
+    """Join numpy arrays of :func:`to_numpy` into one structured array,
+    masked if any of them is."""
+    import numpy
+
+    dtype = [(name, values.dtype) for name, values in zip(names, arrays)]
+    result = numpy.empty(len(arrays[0]) if arrays else 0, dtype=dtype)
+    for name, values in zip(names, arrays):
+        result[name] = numpy.ma.getdata(values)
+    if not any(numpy.ma.isMaskedArray(values) for values in arrays):
+        return result
+    mask = numpy.zeros(len(result), dtype=[(name, numpy.bool_)
+                                           for name in names])
+    for name, values in zip(names, arrays):
+        mask[name] = numpy.ma.getmaskarray(values)
+    return numpy.ma.MaskedArray(result, mask=mask)
@@ -2,13 +2,21 @@
 # http://dev.mysql.com/doc/internals/en/client-server-protocol.html
 
 import asyncio
+import collections
+import datetime
+import io
+import itertools
+import mmap
 import os
 import socket
+import stat
 import struct
 import sys
+import tempfile
 import warnings
 import configparser
 import getpass
+from array import array
 from functools import partial
 
 from pymysql.charset import charset_by_name, charset_by_id
@@ -18,7 +26,7 @@ from pymysql.constants import COMMAND
 from pymysql.constants import FIELD_TYPE
 from pymysql.util import byte2int, int2byte
 from pymysql.converters import (escape_item, encoders, decoders,
-                                escape_string, through)
+                                escape_string, escape_timedelta, through)
 from pymysql.err import (Warning, Error,
                          InterfaceError, DataError, DatabaseError,
                          OperationalError,
@@ -40,9 +48,12 @@ from pymysql.connections import lenenc_int
 
 
 # from aiomysql.utils import _convert_to_str
-from .cursors import Cursor
+from .cursors import Cursor, _aiter_args, _take_args
+from .prepared import PreparedStatement
+from .rows import SpilledRows
+from .template import QueryTemplate
 from .utils import (PY_35, _ConnectionContextManager, _ContextManager,
-                    create_future)
+                    create_future, create_task)
 # from .log import logger
 
 DEFAULT_USER = getpass.getuser()
@@ -56,7 +67,9 @@ def connect(host="localhost", user=None, password="",
             client_flag=0, cursorclass=Cursor, init_command=None,
             connect_timeout=None, read_default_group=None,
             no_delay=None, autocommit=False, echo=False,
-            local_infile=False, loop=None):
+            local_infile=False, max_buffered_bytes=None,
+            buffered_overflow='raise', decode_executor=None,
+            decode_offload_bytes=1048576, kill_on_cancel=False, loop=None):
     """See connections.Connection.__init__() for information about
     defaults."""
     coro = _connect(host=host, user=user, password=password, db=db,
@@ -68,7 +81,12 @@ def connect(host="localhost", user=None, password="",
                     connect_timeout=connect_timeout,
                     read_default_group=read_default_group,
                     no_delay=no_delay, autocommit=autocommit, echo=echo,
-                    local_infile=local_infile, loop=loop)
+                    local_infile=local_infile,
+                    max_buffered_bytes=max_buffered_bytes,
+                    buffered_overflow=buffered_overflow,
+                    decode_executor=decode_executor,
+                    decode_offload_bytes=decode_offload_bytes,
+                    kill_on_cancel=kill_on_cancel, loop=loop)
     return _ConnectionContextManager(coro)
 
 
@@ -86,6 +104,21 @@ class Connection:
     connect().
     """
 
+    #: Number of query templates :meth:`compile` keeps per connection.
+    template_cache_size = 256
+
+    #: Number of prepared statements :class:`PreparedCursor` keeps open per
+    #: connection.
+    statement_cache_size = 64
+
+    #: Packets with smaller payloads are joined with their header into one
+    #: buffer, bigger payloads are passed to the transport on their own.
+    write_join_threshold = 65536
+
+    #: Seconds ``kill_on_cancel`` waits for a side connection to kill the
+    #: query before it closes this connection.
+    kill_timeout = 10
+
     def __init__(self, host="localhost", user=None, password="",
                  db=None, port=3306, unix_socket=None,
                  charset='', sql_mode=None,
@@ -93,7 +126,10 @@ class Connection:
                  client_flag=0, cursorclass=Cursor, init_command=None,
                  connect_timeout=None, read_default_group=None,
                  no_delay=None, autocommit=False, echo=False,
-                 local_infile=False, loop=None):
+                 local_infile=False, max_buffered_bytes=None,
+                 buffered_overflow='raise', decode_executor=None,
+                 decode_offload_bytes=1048576, kill_on_cancel=False,
+                 loop=None):
         """
         Establish a connection to the MySQL database. Accepts several
         arguments:
@@ -127,6 +163,20 @@ class Connection:
             (default: False)
         :param local_infile: boolean to enable the use of LOAD DATA LOCAL
             command. (default: False)
+        :param max_buffered_bytes: Limit of row data a buffered cursor may
+            read for one result set, None means no limit. (default: None)
+        :param buffered_overflow: What to do with results exceeding
+            max_buffered_bytes, 'raise' OperationalError or 'spill' rows
+            past the limit to a temporary file. (default: 'raise')
+        :param decode_executor: concurrent.futures executor decoding rows of
+            big buffered results, None decodes in the event loop thread.
+        :param decode_offload_bytes: Size of row data chunks sent to
+            decode_executor, smaller results are decoded in place.
+            (default: 1048576)
+        :param kill_on_cancel: On cancellation of a running query send
+            KILL QUERY through a side connection instead of closing this
+            one, True opens a new side connection each time, a Pool lends
+            one. (default: False)
         :param loop: asyncio loop
         """
         self._loop = loop or asyncio.get_event_loop()
@@ -180,6 +230,16 @@ class Connection:
         if local_infile:
             client_flag |= CLIENT.LOCAL_FILES
 
+        if buffered_overflow not in ('raise', 'spill'):
+            raise ValueError("buffered_overflow should be 'raise' or 'spill'")
+        self._max_buffered_bytes = max_buffered_bytes
+        self._buffered_overflow = buffered_overflow
+        self._decode_executor = decode_executor
+        self._decode_offload_bytes = decode_offload_bytes
+        self._kill_on_cancel = kill_on_cancel
+        # task reading a query result or draining it after KILL QUERY
+        self._reading = None
+
         client_flag |= CLIENT.CAPABILITIES
         client_flag |= CLIENT.MULTI_STATEMENTS
         if self._db:
@@ -207,6 +267,12 @@ class Connection:
         # If connection was closed for specific reason, we should show that to
         # user
         self._close_reason = None
+        # in-memory row sources for LOAD DATA LOCAL INFILE, by virtual name
+        self._local_infile_rows = {}
+        self._local_infile_seq = itertools.count()
+        # parsed statements by source, see compile()
+        self._templates = collections.OrderedDict()
+        self._statements = collections.OrderedDict()
 
         self._auth_plugin_name = ""
 
@@ -363,6 +429,93 @@ class Connection:
             return s.replace("'", "''")
         return escape_string(s)
 
+    def compile(self, sql):
+        """Parse placeholders of *sql* once and return the template
+
+        Templates are cached per connection, :meth:`Cursor.execute` uses
+        them for statements with arguments.
+
+        :param sql: ``str`` statement with ``%s`` or ``%(name)s``
+            placeholders
+        :returns: :class:`~aiomysql.template.QueryTemplate`
+        """
+        template = self._templates.get(sql)
+        if template is None:
+            if len(self._templates) >= self.template_cache_size:
+                self._templates.popitem(last=False)
+            template = self._templates[sql] = QueryTemplate(sql)
+        else:
+            self._templates.move_to_end(sql)
+        return template
+
+    @asyncio.coroutine
+    def prepare(self, sql):
+        """Prepare *sql* on the server and return the statement
+
+        Parameters of prepared statements are marked with ``?`` and sent
+        in the binary protocol without escaping, big binary parameters
+        are streamed to the server in chunks.
+
+        :param sql: ``str`` statement with ``?`` markers
+        :returns: :class:`~aiomysql.prepared.PreparedStatement`
+        """
+        if isinstance(sql, str):
+            sql = sql.encode(self.encoding, 'surrogateescape')
+        yield from self._execute_command(COMMAND.COM_STMT_PREPARE, sql)
+        packet = yield from self._read_packet()
+        packet.advance(1)
+        statement_id = packet.read_uint32()
+        column_count = packet.read_uint16()
+        param_count = packet.read_uint16()
+        if param_count:
+            yield from self._read_field_packets(param_count)
+        fields = []
+        if column_count:
+            fields = yield from self._read_field_packets(column_count)
+        return PreparedStatement(self, statement_id, sql, param_count,
+                                 fields)
+
+    @asyncio.coroutine
+    def _read_field_packets(self, count):
+        fields = []
+        for i in range(count):
+            field = yield from self._read_packet(FieldDescriptorPacket)
+            fields.append(field)
+        eof_packet = yield from self._read_packet()
+        assert eof_packet.is_eof_packet(), 'Protocol error, expecting EOF'
+        return fields
+
+    @asyncio.coroutine
+    def _prepare_cached(self, sql):
+        """Prepared statement for *sql* from the cache of the connection,
+        the least recently used one is closed to make room."""
+        statement = self._statements.pop(sql, None)
+        if statement is None or statement.closed:
+            if len(self._statements) >= self.statement_cache_size:
+                _, oldest = self._statements.popitem(last=False)
+                yield from oldest.close()
+            statement = yield from self.prepare(sql)
+        self._statements[sql] = statement
+        return statement
+
+    @asyncio.coroutine
+    def _send_long_data(self, statement_id, param_id, chunk):
+        """Send *chunk* in COM_STMT_SEND_LONG_DATA packets, the server
+        does not answer them."""
+        yield from self._finish_result()
+        header = struct.pack('<BIH', COMMAND.COM_STMT_SEND_LONG_DATA,
+                             statement_id, param_id)
+        # every packet is a command of its own, split chunks which do not
+        # fit into one packet with the header
+        size = MAX_PACKET_LEN - len(header)
+        view = memoryview(chunk)
+        for offset in range(0, len(view), size):
+            part = view[offset:offset + size]
+            self._write_packet_parts(
+                pack_int24(len(header) + len(part)) + b'\0' + header, part)
+        self._next_seq_id = 1
+        yield from self._writer.drain()
+
     def cursor(self, cursor=None):
         """Instantiates and returns a cursor
 
@@ -387,20 +540,58 @@ class Connection:
         return _ContextManager(fut)
 
     # The following methods are INTERNAL USE ONLY (called from Cursor)
+    def _register_local_rows(self, rows):
+        """Register rows iterable as virtual LOAD DATA LOCAL INFILE file
+        and return its name."""
+        name = 'aiomysql_rows_%d' % next(self._local_infile_seq)
+        self._local_infile_rows[name.encode(self._encoding)] = rows
+        return name
+
+    def _unregister_local_rows(self, name):
+        self._local_infile_rows.pop(name.encode(self._encoding), None)
+
     @asyncio.coroutine
-    def query(self, sql, unbuffered=False):
+    def query(self, sql, unbuffered=False, row_builder=None):
         # logger.debug("DEBUG: sending query: %s", _convert_to_str(sql))
         if isinstance(sql, str):
             sql = sql.encode(self.encoding, 'surrogateescape')
         yield from self._execute_command(COMMAND.COM_QUERY, sql)
-        yield from self._read_query_result(unbuffered=unbuffered)
+        yield from self._read_query_result(unbuffered=unbuffered,
+                                           row_builder=row_builder)
         return self._affected_rows
 
     @asyncio.coroutine
-    def next_result(self):
-        yield from self._read_query_result()
+    def next_result(self, row_builder=None):
+        yield from self._read_query_result(row_builder=row_builder)
         return self._affected_rows
 
+    @asyncio.coroutine
+    def _send_query(self, sql):
+        """Send query without reading its result, used for pipelining.
+
+        Returns sequence id of the first response packet, which should be
+        passed to :meth:`_read_pipelined_result` once results of all
+        previously sent queries are read.
+        """
+        if isinstance(sql, str):
+            sql = sql.encode(self.encoding, 'surrogateescape')
+        yield from self._execute_command(COMMAND.COM_QUERY, sql)
+        yield from self._writer.drain()
+        return self._next_seq_id
+
+    @asyncio.coroutine
+    def _read_pipelined_result(self, seq_id):
+        """Read all results of query sent by :meth:`_send_query`, MySQL
+        answers queries in the order they were sent."""
+        yield from self._wait_reading()
+        self._next_seq_id = seq_id
+        yield from self._read_query_result()
+        rows = self._affected_rows
+        while self._result.has_next:
+            yield from self.next_result()
+            rows += self._affected_rows
+        return rows
+
     def affected_rows(self):
         return self._affected_rows
 
@@ -464,6 +655,8 @@ class Connection:
                 self._set_nodelay(True)
 
             self._next_seq_id = 0
+            # statements prepared in a previous session are gone
+            self._statements.clear()
 
             yield from self._get_server_information()
             yield from self._request_authentication()
@@ -513,10 +706,19 @@ class Connection:
         """
         # Internal note: when you build packet manually and calls
         # _write_bytes() directly, you should set self._next_seq_id properly.
-        data = pack_int24(len(payload)) + int2byte(self._next_seq_id) + payload
-        self._write_bytes(data)
+        header = pack_int24(len(payload)) + int2byte(self._next_seq_id)
+        self._write_packet_parts(header, payload)
         self._next_seq_id = (self._next_seq_id + 1) % 256
 
+    def _write_packet_parts(self, header, payload):
+        if len(payload) < self.write_join_threshold:
+            self._write_bytes(header + payload)
+        else:
+            # do not join big payloads with the header, writelines() of
+            # the transport would join them as well
+            self._write_bytes(header)
+            self._write_bytes(payload)
+
     @asyncio.coroutine
     def _read_packet(self, packet_type=MysqlPacket):
         """Read an entire "mysql packet" in its entirety from the network
@@ -560,6 +762,38 @@ class Connection:
         packet.check_error()
         return packet
 
+    def _read_packet_nowait(self, packet_type=MysqlPacket):
+        """Return next packet if it is already received in full, otherwise
+        ``None``. Lets callers decode packets sitting in the receive buffer
+        without a suspension per packet.
+        """
+        # _buffer and _maybe_resume_transport are private attributes of
+        # asyncio.StreamReader, if a reader lacks them callers fall back to
+        # awaiting _read_packet for every packet
+        buff = getattr(self._reader, '_buffer', None)
+        resume = getattr(self._reader, '_maybe_resume_transport', None)
+        if not isinstance(buff, bytearray) or resume is None or \
+                len(buff) < 4:
+            return None
+        btrl, btrh, packet_number = struct.unpack_from('<HBB', buff)
+        bytes_to_read = btrl + (btrh << 16)
+        # multi-packet payloads are assembled by _read_packet
+        if bytes_to_read >= MAX_PACKET_LEN or len(buff) < bytes_to_read + 4:
+            return None
+        if packet_number != self._next_seq_id:
+            raise InternalError(
+                "Packet sequence number wrong - got %d expected %d" %
+                (packet_number, self._next_seq_id))
+        self._next_seq_id = (self._next_seq_id + 1) % 256
+
+        recv_data = bytes(buff[4:bytes_to_read + 4])
+        del buff[:bytes_to_read + 4]
+        resume()
+
+        packet = packet_type(recv_data, self._encoding)
+        packet.check_error()
+        return packet
+
     @asyncio.coroutine
     def _read_bytes(self, num_bytes):
         try:
@@ -576,7 +810,77 @@ class Connection:
         return self._writer.write(data)
 
     @asyncio.coroutine
-    def _read_query_result(self, unbuffered=False):
+    def _wait_reading(self):
+        # a cancelled read may not have noticed its cancellation yet
+        while self._reading is not None and not self._reading.done():
+            yield from asyncio.wait([self._reading], loop=self._loop)
+
+    @asyncio.coroutine
+    def _read_query_result(self, unbuffered=False, row_builder=None):
+        # results of a killed query are still drained
+        yield from self._wait_reading()
+        self._ensure_alive()
+        if not self._kill_on_cancel or unbuffered:
+            yield from self._read_result(unbuffered, row_builder)
+            return
+        # the result is read by a task of its own, so a cancellation
+        # leaves it running until the killed query answers
+        reading = create_task(self._read_result(row_builder=row_builder),
+                              self._loop)
+        self._reading = reading
+        try:
+            yield from asyncio.shield(reading, loop=self._loop)
+        except asyncio.CancelledError:
+            if not reading.done():
+                self._reading = create_task(self._kill_and_drain(reading),
+                                            self._loop)
+            raise
+        self._reading = None
+
+    @asyncio.coroutine
+    def _kill_and_drain(self, reading):
+        """Interrupt the query whose result *reading* waits for and read
+        what is left of its results, closes the connection if the query
+        cannot be killed."""
+        try:
+            yield from asyncio.wait_for(self._kill_query(), self.kill_timeout,
+                                        loop=self._loop)
+            try:
+                yield from reading
+                while self._result.has_next:
+                    yield from self._read_result()
+            except Error:
+                # an error ends the results of the statement
+                self._result = None
+        except Exception:
+            # reading closes the connection when cancelled
+            reading.cancel()
+            yield from asyncio.wait([reading], loop=self._loop)
+        finally:
+            self._reading = None
+
+    @asyncio.coroutine
+    def _kill_query(self):
+        sql = "KILL QUERY %d" % self.server_thread_id[0]
+        pool = self._kill_on_cancel
+        if hasattr(pool, 'acquire'):
+            conn = yield from pool.acquire()
+            try:
+                yield from conn.query(sql)
+            finally:
+                pool.release(conn)
+        else:
+            conn = yield from _connect(
+                host=self._host, port=self._port, user=self._user,
+                password=self._password, unix_socket=self._unix_socket,
+                connect_timeout=self.connect_timeout, loop=self._loop)
+            try:
+                yield from conn.query(sql)
+            finally:
+                yield from conn.ensure_closed()
+
+    @asyncio.coroutine
+    def _read_result(self, unbuffered=False, row_builder=None):
         if unbuffered:
             try:
                 result = MySQLResult(self)
@@ -586,7 +890,7 @@ class Connection:
                 result.connection = None
                 raise
         else:
-            result = MySQLResult(self)
+            result = MySQLResult(self, row_builder)
             yield from result.read()
         self._result = result
         self._affected_rows = result.affected_rows
@@ -613,7 +917,8 @@ class Connection:
             return
 
     @asyncio.coroutine
-    def _execute_command(self, command, sql):
+    def _finish_result(self):
+        yield from self._wait_reading()
         self._ensure_alive()
 
         # If the last query was unbuffered, make sure it finishes before
@@ -621,18 +926,24 @@ class Connection:
         if self._result is not None:
             if self._result.unbuffered_active:
                 warnings.warn("Previous unbuffered result was left incomplete")
-                self._result._finish_unbuffered_query()
+                yield from self._result._finish_unbuffered_query()
             while self._result.has_next:
                 yield from self.next_result()
             self._result = None
 
+    @asyncio.coroutine
+    def _execute_command(self, command, sql):
+        yield from self._finish_result()
+
         if isinstance(sql, str):
             sql = sql.encode(self._encoding)
+        # slices of a view do not copy the statement
+        sql = memoryview(sql)
 
         chunk_size = min(MAX_PACKET_LEN, len(sql) + 1)  # +1 is for command
 
         prelude = struct.pack('<iB', chunk_size, command)
-        self._write_bytes(prelude + sql[:chunk_size - 1])
+        self._write_packet_parts(prelude, sql[:chunk_size - 1])
         # logger.debug(dump_packet(prelude + sql))
         self._next_seq_id = 1
 
@@ -824,8 +1135,9 @@ class Connection:
 # of MysqlPacket like has been done with FieldDescriptorPacket.
 class MySQLResult:
 
-    def __init__(self, connection):
+    def __init__(self, connection, row_builder=None):
         self.connection = connection
+        self.row_builder = row_builder
         self.affected_rows = None
         self.insert_id = None
         self.server_status = None
@@ -836,6 +1148,8 @@ class MySQLResult:
         self.rows = None
         self.has_next = None
         self.unbuffered_active = False
+        self.cursor_exists = False
+        self._stream = None
 
     @asyncio.coroutine
     def read(self):
@@ -886,7 +1200,12 @@ class MySQLResult:
     @asyncio.coroutine
     def _read_load_local_packet(self, first_packet):
         load_packet = LoadLocalPacketWrapper(first_packet)
-        sender = LoadLocalFile(load_packet.filename, self.connection)
+        rows = self.connection._local_infile_rows.pop(load_packet.filename,
+                                                      None)
+        if rows is not None:
+            sender = LoadLocalRows(rows, self.connection)
+        else:
+            sender = LoadLocalFile(load_packet.filename, self.connection)
         try:
             yield from sender.send_data()
         except Exception:
@@ -911,10 +1230,21 @@ class MySQLResult:
     def _read_result_packet(self, first_packet):
         self.field_count = first_packet.read_length_encoded_integer()
         yield from self._get_descriptions()
+        if self.cursor_exists:
+            # rows stay in the server side cursor until they are fetched
+            self.rows = ()
+            return
         yield from self._read_rowdata_packet()
 
+    @asyncio.coroutine
+    def _close_stream(self):
+        """Skip the rest of a row whose column was being streamed"""
+        if self._stream is not None:
+            yield from self._stream.discard()
+
     @asyncio.coroutine
     def _read_rowdata_packet_unbuffered(self):
+        yield from self._close_stream()
         # Check if in an active query
         if not self.unbuffered_active:
             return
@@ -932,11 +1262,40 @@ class MySQLResult:
         self.rows = (row,)
         return row
 
+    @asyncio.coroutine
+    def _read_rowdata_packets_unbuffered(self, size):
+        """Read up to *size* rows, rows already received are decoded in one
+        go, we only wait when the receive buffer runs dry."""
+        yield from self._close_stream()
+        rows = []
+        if not self.unbuffered_active or size <= 0:
+            return rows
+
+        conn = self.connection
+        packet = yield from conn._read_packet()
+        while True:
+            if self._check_packet_is_eof(packet):
+                self.unbuffered_active = False
+                self.connection = None
+                self.rows = None
+                return rows
+            rows.append(self._read_row_from_packet(packet))
+            if len(rows) >= size:
+                break
+            packet = conn._read_packet_nowait()
+            if packet is None:
+                packet = yield from conn._read_packet()
+
+        self.affected_rows = len(rows)
+        self.rows = tuple(rows)
+        return rows
+
     @asyncio.coroutine
     def _finish_unbuffered_query(self):
         # After much reading on the MySQL protocol, it appears that there is,
         # in fact, no way to stop MySQL from sending all the data after
         # executing a query, so we just spin, and wait for an EOF packet.
+        yield from self._close_stream()
         while self.unbuffered_active:
             packet = yield from self.connection._read_packet()
             if self._check_packet_is_eof(packet):
@@ -947,34 +1306,110 @@ class MySQLResult:
     @asyncio.coroutine
     def _read_rowdata_packet(self):
         """Read a rowdata packet for each data row in the result set."""
+        if self.row_builder is not None:
+            yield from self._read_rowdata_packet_built()
+            return
+        conn = self.connection
+        limit = conn._max_buffered_bytes
+        size = 0
         rows = []
+        if conn._decode_executor is not None:
+            decoder = _OffloadedDecoder(self, conn._decode_executor,
+                                        conn._decode_offload_bytes)
+        else:
+            decoder = None
+        try:
+            while True:
+                packet = yield from conn._read_packet()
+                if self._check_packet_is_eof(packet):
+                    # release reference to kill cyclic reference.
+                    self.connection = None
+                    break
+                if limit is not None:
+                    size += len(packet.get_all_data())
+                    if size > limit:
+                        if decoder is not None:
+                            rows = yield from decoder.finish()
+                        yield from self._buffer_overflow(packet, rows)
+                        return
+                if decoder is None:
+                    rows.append(self._read_row_from_packet(packet))
+                else:
+                    decoder.add(packet.get_all_data())
+            if decoder is not None:
+                rows = yield from decoder.finish()
+        except BaseException:
+            if decoder is not None:
+                decoder.cancel()
+            raise
+
+        self.affected_rows = len(rows)
+        self.rows = tuple(rows)
+
+    @asyncio.coroutine
+    def _buffer_overflow(self, packet, rows):
+        """Handle result exceeding max_buffered_bytes, *packet* is the
+        first row which does not fit."""
+        conn = self.connection
+        if conn._buffered_overflow == 'spill' and self.row_builder is None:
+            yield from self._spill_rowdata_packets(packet, rows)
+            return
+        # read the rest of the result, so connection stays usable
+        while not self._check_packet_is_eof(packet):
+            packet = yield from conn._read_packet()
+        self.connection = None
+        # following result sets are skipped before the next command
+        conn._result = self
+        raise OperationalError(
+            2008, "Result set exceeds max_buffered_bytes (%d)" %
+            conn._max_buffered_bytes)
+
+    @asyncio.coroutine
+    def _spill_rowdata_packets(self, packet, rows):
+        conn = self.connection
+        self._encoding = conn.encoding
+        spill = tempfile.TemporaryFile()
+        offsets = array('Q', [0])
+        try:
+            while not self._check_packet_is_eof(packet):
+                data = packet.get_all_data()
+                spill.write(data)
+                offsets.append(offsets[-1] + len(data))
+                packet = yield from conn._read_packet()
+        except BaseException:
+            spill.close()
+            raise
+        self.connection = None
+        self.rows = SpilledRows(tuple(rows), spill, offsets,
+                                self._decode_spilled_row)
+        self.affected_rows = len(self.rows)
+
+    def _decode_spilled_row(self, data):
+        return self._read_row_from_packet(MysqlPacket(data, self._encoding))
+
+    @asyncio.coroutine
+    def _read_rowdata_packet_built(self):
+        """Feed rowdata packets to the row builder of the cursor, which
+        decides how rows are stored."""
+        builder = self.row_builder(self)
+        limit = self.connection._max_buffered_bytes
+        size = 0
         while True:
             packet = yield from self.connection._read_packet()
             if self._check_packet_is_eof(packet):
-                # release reference to kill cyclic reference.
                 self.connection = None
                 break
-            rows.append(self._read_row_from_packet(packet))
+            if limit is not None:
+                size += len(packet.get_all_data())
+                if size > limit:
+                    yield from self._buffer_overflow(packet, None)
+            builder.add_row(packet)
 
-        self.affected_rows = len(rows)
-        self.rows = tuple(rows)
+        self.rows = builder.finish()
+        self.affected_rows = len(self.rows)
 
     def _read_row_from_packet(self, packet):
-        row = []
-        for encoding, converter in self.converters:
-            try:
-                data = packet.read_length_coded_string()
-            except IndexError:
-                # No more columns in this row
-                # See https://github.com/PyMySQL/PyMySQL/pull/434
-                break
-            if data is not None:
-                if encoding is not None:
-                    data = data.decode(encoding)
-                if converter is not None:
-                    data = converter(data)
-            row.append(data)
-        return tuple(row)
+        return _read_row(packet, self.converters)
 
     @asyncio.coroutine
     def _get_descriptions(self):
@@ -1019,10 +1454,86 @@ class MySQLResult:
 
         eof_packet = yield from self.connection._read_packet()
         assert eof_packet.is_eof_packet(), 'Protocol error, expecting EOF'
+        self.cursor_exists = bool(
+            EOFPacketWrapper(eof_packet).server_status &
+            SERVER_STATUS.SERVER_STATUS_CURSOR_EXISTS)
         self.description = tuple(description)
 
 
+def _read_row(packet, converters):
+    row = []
+    for encoding, converter in converters:
+        try:
+            data = packet.read_length_coded_string()
+        except IndexError:
+            # No more columns in this row
+            # See https://github.com/PyMySQL/PyMySQL/pull/434
+            break
+        if data is not None:
+            if encoding is not None:
+                data = data.decode(encoding)
+            if converter is not None:
+                data = converter(data)
+        row.append(data)
+    return tuple(row)
+
+
+def _decode_rows(rows_data, converters, encoding):
+    """Decode raw row data packets, runs in executor so converters have
+    to be picklable for process pools."""
+    return [_read_row(MysqlPacket(data, encoding), converters)
+            for data in rows_data]
+
+
+class _OffloadedDecoder:
+    """Decode rows of a buffered result on an executor.
+
+    Raw rows are sent to the executor in chunks of *threshold* bytes while
+    the following rows are still read, rows of results smaller than
+    *threshold* are decoded in place.
+    """
+
+    def __init__(self, result, executor, threshold):
+        self._loop = result.connection.loop
+        self._executor = executor
+        self._threshold = threshold
+        self._args = (result.converters, result.connection.encoding)
+        self._pending = []
+        self._size = 0
+        self._futures = []
+
+    def add(self, data):
+        self._pending.append(data)
+        self._size += len(data)
+        if self._size >= self._threshold:
+            fut = self._loop.run_in_executor(
+                self._executor, _decode_rows, self._pending, *self._args)
+            self._futures.append(fut)
+            self._pending = []
+            self._size = 0
+
+    @asyncio.coroutine
+    def finish(self):
+        rows = []
+        for fut in self._futures:
+            rows.extend((yield from fut))
+        rows.extend(_decode_rows(self._pending, *self._args))
+        return rows
+
+    def cancel(self):
+        for fut in self._futures:
+            fut.cancel()
+
+
 class LoadLocalFile(object):
+
+    #: Size of data packets the file is sent in.
+    chunk_size = MAX_PACKET_LEN
+
+    #: Send regular files straight from a memory map instead of reading
+    #: them chunk by chunk in executor.
+    use_mmap = True
+
     def __init__(self, filename, connection):
         self.filename = filename
         self.connection = connection
@@ -1062,6 +1573,25 @@ class LoadLocalFile(object):
         fut = self._loop.run_in_executor(self._executor, freader, chunk_size)
         return fut
 
+    def _map_file(self):
+        """Map regular file into memory, returns ``None`` for pipes, special
+        and empty files, those are read through executor."""
+        if not self.use_mmap:
+            return None
+        if not isinstance(self._file_object, io.BufferedReader):
+            return None
+        try:
+            fileno = self._file_object.fileno()
+            if not stat.S_ISREG(os.fstat(fileno).st_mode):
+                return None
+            mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # ValueError is raised for empty files
+            return None
+        if hasattr(mapped, 'madvise'):  # pragma: no branch
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return mapped
+
     @asyncio.coroutine
     def send_data(self):
         """Send data packets from the local file to the server"""
@@ -1071,16 +1601,134 @@ class LoadLocalFile(object):
         try:
             yield from self._open_file()
             with self._file_object:
-                chunk_size = MAX_PACKET_LEN
-                while True:
-                    chunk = yield from self._file_read(chunk_size)
-                    if not chunk:
-                        break
-                    # TODO: consider drain data
-                    conn.write_packet(chunk)
+                mapped = self._map_file()
+                if mapped is not None:
+                    yield from self._send_mapped(mapped)
+                else:
+                    yield from self._send_chunks()
+        except asyncio.CancelledError:
+            self.connection._close_on_cancel()
+            raise
+        finally:
+            if not conn.closed:
+                # send the empty packet to signify we are done sending data
+                conn.write_packet(b"")
+
+    @asyncio.coroutine
+    def _send_mapped(self, mapped):
+        # memoryview slices of the mapping are handed to the transport
+        # as is, no chunk is copied into a bytes object
+        conn = self.connection
+        chunk_size = self.chunk_size
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, len(view), chunk_size):
+                conn.write_packet(view[offset:offset + chunk_size])
+                yield from conn._writer.drain()
+        finally:
+            self._close_mapped(view, mapped)
+
+    def _close_mapped(self, view, mapped):
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            # the transport still holds slices of the mapping, try again
+            # once it had time to send them
+            self._loop.call_later(0.1, self._close_mapped, view, mapped)
+
+    @asyncio.coroutine
+    def _send_chunks(self):
+        conn = self.connection
+        chunk_size = self.chunk_size
+        next_chunk = self._file_read(chunk_size)
+        try:
+            while True:
+                # a cancellation must not leave the read running unnoticed
+                chunk = yield from asyncio.shield(next_chunk,
+                                                  loop=self._loop)
+                if not chunk:
+                    break
+                # read ahead next chunk in executor while this one is
+                # being sent
+                next_chunk = self._file_read(chunk_size)
+                conn.write_packet(chunk)
+                # respect transport high-water mark, so huge files do
+                # not pile up in memory
+                yield from conn._writer.drain()
+        finally:
+            # a read already running in the executor can not be cancelled,
+            # wait for it so it does not touch the file closed by
+            # send_data, its result or error is of no use
+            if not next_chunk.done():
+                yield from asyncio.wait([next_chunk], loop=self._loop)
+            if not next_chunk.cancelled():
+                next_chunk.exception()
+
+
+class LoadLocalRows(object):
+    """Sends rows of (async) iterable as tab separated data in answer to
+    LOAD DATA LOCAL INFILE request, nothing touches the disk."""
+
+    #: How many rows are pulled from the iterable at a time.
+    rows_chunk_size = 1000
+
+    def __init__(self, rows, connection):
+        self.rows = rows
+        self.connection = connection
+        self._encoding = connection.encoding
+
+    @asyncio.coroutine
+    def send_data(self):
+        """Send rows as data packets to the server"""
+        self.connection._ensure_alive()
+        conn = self.connection
+        encoding = self._encoding
+        chunk_size = MAX_PACKET_LEN
+        buff = bytearray()
+
+        try:
+            it, is_async = yield from _aiter_args(self.rows)
+            while True:
+                rows = yield from _take_args(it, is_async,
+                                             self.rows_chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    buff += b'\t'.join([_encode_tsv_value(value, encoding)
+                                        for value in row])
+                    buff += b'\n'
+                while len(buff) >= chunk_size:
+                    conn.write_packet(bytes(buff[:chunk_size]))
+                    del buff[:chunk_size]
+                    yield from conn._writer.drain()
+            if buff:
+                conn.write_packet(bytes(buff))
         except asyncio.CancelledError:
             self.connection._close_on_cancel()
             raise
         finally:
-            # send the empty packet to signify we are done sending data
-            conn.write_packet(b"")
+            if not conn.closed:
+                # send the empty packet to signify we are done sending data
+                conn.write_packet(b"")
+
+
+def _encode_tsv_value(value, encoding):
+    """Encode value as field of LOAD DATA default format: tab separated,
+    backslash escaped, NULL written as \\N."""
+    if value is None:
+        return b'\\N'
+    if isinstance(value, str):
+        data = value.encode(encoding, 'surrogateescape')
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+    elif isinstance(value, bool):
+        return b'1' if value else b'0'
+    elif isinstance(value, datetime.timedelta):
+        return escape_timedelta(value)[1:-1].encode('ascii')
+    else:
+        # numbers, dates and times have no characters that need escaping
+        return str(value).encode(encoding)
+    return (data.replace(b'\\', b'\\\\')
+            .replace(b'\t', b'\\t')
+            .replace(b'\n', b'\\n'))
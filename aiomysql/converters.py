@@ -0,0 +1,136 @@
+"""Fast decoders for temporal and decimal columns.
+
+Pass :data:`decoders` (or the result of :func:`make_decoders`) as ``conv``
+argument of :func:`aiomysql.connect` to use them. Values in the formats
+MySQL sends are parsed with fixed offsets, anything else falls back to the
+decoders of pymysql.
+"""
+import datetime
+import functools
+from decimal import Decimal
+
+from pymysql import converters
+from pymysql.constants import FIELD_TYPE
+
+
+def _to_str(obj):
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode('ascii')
+    return obj
+
+
+def _microseconds(fraction):
+    # '5' -> 500000, '123456' -> 123456
+    return int(fraction[:6].ljust(6, '0'))
+
+
+# C parser of Python 3.7+ handles 'YYYY-MM-DD HH:MM:SS[.fff[fff]]'
+_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+_date_fromisoformat = getattr(datetime.date, 'fromisoformat', None)
+
+
+def convert_datetime(obj):
+    """Returns a DATETIME column value as a datetime object"""
+    obj = _to_str(obj)
+    try:
+        if _fromisoformat is not None and len(obj) in (19, 23, 26):
+            return _fromisoformat(obj)
+    except ValueError:
+        pass
+    try:
+        if len(obj) == 19 or len(obj) > 20 and obj[19] == '.':
+            if obj[4] != '-' or obj[7] != '-' or obj[13] != ':':
+                raise ValueError(obj)
+            return datetime.datetime(
+                int(obj[:4]), int(obj[5:7]), int(obj[8:10]),
+                int(obj[11:13]), int(obj[14:16]), int(obj[17:19]),
+                _microseconds(obj[20:]) if len(obj) > 20 else 0)
+    except ValueError:
+        pass
+    return converters.convert_datetime(obj)
+
+
+def convert_mysql_timestamp(obj):
+    """Returns a TIMESTAMP column value as a datetime object"""
+    obj = _to_str(obj)
+    if obj[4:5] == '-':
+        return convert_datetime(obj)
+    return converters.convert_mysql_timestamp(obj)
+
+
+def convert_date(obj):
+    """Returns a DATE column value as a date object"""
+    obj = _to_str(obj)
+    try:
+        if len(obj) == 10 and obj[4] == '-' and obj[7] == '-':
+            if _date_fromisoformat is not None:
+                return _date_fromisoformat(obj)
+            return datetime.date(int(obj[:4]), int(obj[5:7]), int(obj[8:]))
+    except ValueError:
+        pass
+    return converters.convert_date(obj)
+
+
+def convert_timedelta(obj):
+    """Returns a TIME column value as a timedelta object"""
+    obj = _to_str(obj)
+    negative = obj[:1] == '-'
+    try:
+        hours, minutes, seconds = obj[negative:].split(':')
+        if len(minutes) != 2 or len(seconds) < 2:
+            raise ValueError(obj)
+        tdelta = datetime.timedelta(
+            hours=int(hours), minutes=int(minutes),
+            seconds=int(seconds[:2]),
+            microseconds=_microseconds(seconds[3:]) if seconds[2:] else 0)
+    except ValueError:
+        return converters.convert_timedelta(obj)
+    return -tdelta if negative else tdelta
+
+
+def convert_decimal(obj):
+    """Returns a DECIMAL column value as a Decimal object, accepts bytes
+    when use_unicode is off"""
+    return Decimal(_to_str(obj))
+
+
+class _CachedDecoder(object):
+    """Decoder memoizing *maxsize* values. Unlike a plain lru_cache wrapper
+    it can be pickled, a process of a decode_executor pool gets a copy
+    with a cache of its own."""
+
+    def __init__(self, decoder, maxsize):
+        self._decoder = decoder
+        self._maxsize = maxsize
+        self._cached = functools.lru_cache(maxsize=maxsize)(decoder)
+
+    def __call__(self, obj):
+        return self._cached(obj)
+
+    def __reduce__(self):
+        return _CachedDecoder, (self._decoder, self._maxsize)
+
+
+def make_decoders(date_cache_size=0):
+    """Decoders dictionary with the fast decoders.
+
+    :param date_cache_size: if set, DATE values are memoized in a cache of
+        this many entries, which pays off for low-cardinality dates.
+    """
+    result = dict(converters.decoders)
+    result.update({
+        FIELD_TYPE.DATETIME: convert_datetime,
+        FIELD_TYPE.TIMESTAMP: convert_mysql_timestamp,
+        FIELD_TYPE.DATE: convert_date,
+        FIELD_TYPE.TIME: convert_timedelta,
+        FIELD_TYPE.DECIMAL: convert_decimal,
+        FIELD_TYPE.NEWDECIMAL: convert_decimal,
+    })
+    if date_cache_size:
+        result[FIELD_TYPE.DATE] = _CachedDecoder(convert_date,
+                                                 date_cache_size)
+    return result
+
+
+#: Default decoders with the fast temporal and decimal decoders
+decoders = make_decoders()
@@ -1,14 +1,25 @@
 import asyncio
+import collections
+import functools
+import itertools
 import re
 import warnings
+import weakref
 
+from pymysql.constants import CLIENT
 from pymysql.err import (
     Warning, Error, InterfaceError, DataError,
     DatabaseError, OperationalError, IntegrityError, InternalError,
     NotSupportedError, ProgrammingError)
 
+from .columnar import ColumnarBuilder, to_numpy, to_structured
 from .log import logger
-from .utils import PY_35, create_future
+from .prepared import (BinaryRowBuilder, CURSOR_TYPE_READ_ONLY,
+                       column_readers)
+from .rows import DictRow, LazyRowBuilder, SpilledRows
+from .streaming import ColumnStream
+from .template import QueryTemplate
+from .utils import PY_35, create_future, create_task
 
 
 # https://github.com/PyMySQL/PyMySQL/blob/master/pymysql/cursors.py#L11-L18
@@ -22,6 +33,11 @@ RE_INSERT_VALUES = re.compile(
     r"(\s*(?:ON DUPLICATE.*)?);?\s*\Z",
     re.IGNORECASE | re.DOTALL)
 
+#: Statements :meth:`Cursor.executemany` may send several at once, joined
+#: into one multi-statement query.
+RE_MULTI_STATEMENTS = re.compile(
+    r"\s*(?:UPDATE|DELETE|INSERT|REPLACE)\s", re.IGNORECASE)
+
 
 class Cursor:
     """Cursor is used to interact with the database."""
@@ -33,6 +49,14 @@ class Cursor:
     #: Default value of max_allowed_packet is 1048576.
     max_stmt_length = 1024000
 
+    #: How many parameter sets :meth:`executemany` pulls from its
+    #: iterable at a time.
+    args_chunk_size = 1000
+
+    # Factory of the object that stores rows of buffered results, see
+    # :class:`ColumnarCursor`. None keeps rows as a tuple of tuples.
+    _row_builder = None
+
     def __init__(self, connection, echo=False):
         """Do not create an instance of a Cursor yourself. Call
         connections.Connection.cursor().
@@ -160,6 +184,12 @@ class Cursor:
                 pass
         finally:
             self._connection = None
+            self._close_rows()
+
+    def _close_rows(self):
+        # rows spilled to disk keep a temporary file open
+        if isinstance(self._rows, SpilledRows):
+            self._rows.close()
 
     def _get_db(self):
         if not self._connection:
@@ -188,7 +218,9 @@ class Cursor:
             return
         if not current_result.has_next:
             return
-        yield from conn.next_result()
+        # following results of a statement come in the protocol of the
+        # first one, text or binary
+        yield from conn.next_result(row_builder=current_result.row_builder)
         yield from self._do_get_result()
         return True
 
@@ -212,9 +244,15 @@ class Cursor:
         """
         conn = self._get_db()
         if args is not None:
-            query = query % self._escape_args(args, conn)
+            query = self._format_query(query, args, conn)
         return query
 
+    def _format_query(self, query, args, conn):
+        if (isinstance(query, str) and
+                type(self)._escape_args is Cursor._escape_args):
+            return conn.compile(query).render(args, conn)
+        return query % self._escape_args(args, conn)
+
     @asyncio.coroutine
     def execute(self, query, args=None):
         """Executes the given operation
@@ -235,7 +273,7 @@ class Cursor:
             pass
 
         if args is not None:
-            query = query % self._escape_args(args, conn)
+            query = self._format_query(query, args, conn)
 
         yield from self._query(query)
         self._executed = query
@@ -245,7 +283,8 @@ class Cursor:
         return self._rowcount
 
     @asyncio.coroutine
-    def executemany(self, query, args):
+    def executemany(self, query, args, *, commit_every=None, pipeline=0,
+                    batch_statements=False):
         """Execute the given operation multiple times
 
         The executemany() method will execute the operation iterating
@@ -262,10 +301,32 @@ class Cursor:
             yield from cursor.executemany(stmt, data)
 
         INSERT or REPLACE statements are optimized by batching the data,
-        that is using the MySQL multiple rows syntax.
+        that is using the MySQL multiple rows syntax. Other UPDATE, DELETE,
+        INSERT or REPLACE statements are batched as multi-statement
+        queries with *batch_statements*, so many of them take one round
+        trip.
+
+        *args* may also be any iterator, generator or asynchronous
+        iterable; parameters are consumed lazily, so a generator of
+        millions of rows is never materialized in memory.
 
         :param query: `str`, sql statement
-        :param args: ``tuple`` or ``list`` of arguments for sql query
+        :param args: ``tuple`` or ``list`` of arguments for sql query,
+            or (async) iterable producing them
+        :param commit_every: ``int``, commit after every *commit_every*
+            batches sent to the server and after the last one, ``None``
+            (default) leaves transaction control to the caller
+        :param pipeline: ``int``, how many batches may be sent before
+            results of earlier ones are read. With ``1`` next batch is
+            encoded while the server executes the previous one, bigger
+            values keep several batches in flight. ``0`` (default) waits
+            for every batch before building the next one.
+        :param batch_statements: ``bool``, join statements other than
+            ``INSERT ... VALUES`` into multi-statement queries. A failing
+            statement stops the rest of its batch, statements of earlier
+            batches stay executed.
+        :returns: ``int``, number of affected rows, ``None`` if *args* is
+            empty
         """
         if not args:
             return
@@ -282,47 +343,216 @@ class Cursor:
             assert q_values[0] == '(' and q_values[-1] == ')'
             return (yield from self._do_execute_many(
                 q_prefix, q_values, q_postfix, args, self.max_stmt_length,
-                self._get_db().encoding))
+                self._get_db().encoding, commit_every, pipeline))
+        elif (batch_statements and
+                self._get_db().client_flag & CLIENT.MULTI_STATEMENTS and
+                RE_MULTI_STATEMENTS.match(query)):
+            query = query.rstrip()
+            if query.endswith(';'):
+                query = query[:-1]
+            # a trailing -- or # comment of the statement ends at the
+            # line break, not at the separator
+            return (yield from self._do_execute_many(
+                '', query + '\n', '', args, self.max_stmt_length,
+                self._get_db().encoding, commit_every, pipeline, b';\n'))
         else:
-            rows = 0
-            for arg in args:
+            return (yield from self._execute_each(query, args, commit_every))
+
+    @asyncio.coroutine
+    def _execute_each(self, query, args, commit_every=None):
+        """Execute *query* once for every item of *args*"""
+        conn = self._get_db()
+        it, is_async = yield from _aiter_args(args)
+        rows = 0
+        statements = 0
+        while True:
+            chunk = yield from _take_args(it, is_async, self.args_chunk_size)
+            if not chunk:
+                break
+            for arg in chunk:
                 yield from self.execute(query, arg)
                 rows += self._rowcount
-            self._rowcount = rows
+                statements += 1
+                if commit_every and statements % commit_every == 0:
+                    yield from conn.commit()
+        if not statements:
+            # empty iterable, same as empty sequence
+            return None
+        if commit_every and statements % commit_every:
+            yield from conn.commit()
+        self._rowcount = rows
         return self._rowcount
 
     @asyncio.coroutine
     def _do_execute_many(self, prefix, values, postfix, args, max_stmt_length,
-                         encoding):
+                         encoding, commit_every=None, pipeline=0,
+                         separator=b','):
         conn = self._get_db()
         escape = self._escape_args
         if isinstance(prefix, str):
             prefix = prefix.encode(encoding)
         if isinstance(postfix, str):
             postfix = postfix.encode(encoding)
+        it, is_async = yield from _aiter_args(args)
+        inflight = collections.deque()
+        if pipeline:
+            while (yield from self.nextset()):
+                pass
+        if (isinstance(values, str) and
+                type(self)._escape_args is Cursor._escape_args):
+            # rows are escaped column-wise straight into the statement
+            template = QueryTemplate(values)
+        else:
+            template = None
         sql = bytearray(prefix)
-        args = iter(args)
-        v = values % escape(next(args), conn)
-        if isinstance(v, str):
-            v = v.encode(encoding, 'surrogateescape')
-        sql += v
+        pending = 0
         rows = 0
-        for arg in args:
-            v = values % escape(arg, conn)
-            if isinstance(v, str):
-                v = v.encode(encoding, 'surrogateescape')
-            if len(sql) + len(v) + len(postfix) + 1 > max_stmt_length:
-                r = yield from self.execute(sql + postfix)
-                rows += r
-                sql = bytearray(prefix)
-            else:
-                sql += b','
-            sql += v
-        r = yield from self.execute(sql + postfix)
-        rows += r
+        statements = 0
+        empty = True
+        while True:
+            chunk = yield from _take_args(it, is_async, self.args_chunk_size)
+            if not chunk:
+                break
+            empty = False
+            for arg in chunk:
+                mark = len(sql)
+                if pending:
+                    sql += separator
+                if template is not None:
+                    template.render_into(sql, arg, conn, encoding)
+                else:
+                    v = values % escape(arg, conn)
+                    if isinstance(v, str):
+                        v = v.encode(encoding, 'surrogateescape')
+                    sql += v
+                if pending and len(sql) + len(postfix) > max_stmt_length:
+                    v = sql[mark + len(separator):]
+                    del sql[mark:]
+                    rows += yield from self._execute_batch(
+                        sql + postfix, inflight, pipeline)
+                    statements += 1
+                    if commit_every and statements % commit_every == 0:
+                        rows += yield from self._finish_pipeline(inflight)
+                        yield from conn.commit()
+                    sql = bytearray(prefix)
+                    sql += v
+                    pending = 0
+                pending += 1
+        if empty:
+            # empty iterable, same as empty sequence
+            return None
+        if pending:
+            rows += yield from self._execute_batch(
+                sql + postfix, inflight, pipeline)
+            statements += 1
+        rows += yield from self._finish_pipeline(inflight)
+        if commit_every and statements % commit_every:
+            yield from conn.commit()
         self._rowcount = rows
         return rows
 
+    @asyncio.coroutine
+    def _execute_batch(self, sql, inflight, pipeline):
+        """Execute one statement generated by :meth:`executemany`.
+
+        In pipeline mode statement is only sent, results of the oldest
+        in flight statements are read once more than *pipeline* of them
+        are unanswered. Returns number of rows affected by statements
+        completed during the call.
+        """
+        if not pipeline:
+            rows = yield from self.execute(sql)
+            # multi-statement batch returns one result per statement
+            while (yield from self.nextset()):
+                rows += self._rowcount
+            return rows
+        conn = self._get_db()
+        rows = 0
+        while len(inflight) >= pipeline:
+            rows += yield from self._read_pipelined(inflight)
+        inflight.append((yield from conn._send_query(sql)))
+        self._last_executed = sql
+        self._executed = sql
+        return rows
+
+    @asyncio.coroutine
+    def _read_pipelined(self, inflight):
+        conn = self._get_db()
+        try:
+            return (yield from conn._read_pipelined_result(
+                inflight.popleft()))
+        except asyncio.CancelledError:
+            if inflight:
+                # statements sent after the cancelled one are not killed,
+                # do not keep the connection busy until they finish
+                conn._close_on_cancel()
+            inflight.clear()
+            raise
+        except Exception:
+            # statements already sent are executed by the server anyway,
+            # read their results to keep connection in sync
+            try:
+                while inflight and not conn.closed:
+                    try:
+                        yield from conn._read_pipelined_result(
+                            inflight.popleft())
+                    except asyncio.CancelledError:
+                        conn._close_on_cancel()
+                        raise
+                    except Exception:
+                        pass
+            finally:
+                inflight.clear()
+            raise
+
+    @asyncio.coroutine
+    def _finish_pipeline(self, inflight):
+        if not inflight:
+            return 0
+        rows = 0
+        while inflight:
+            rows += yield from self._read_pipelined(inflight)
+        yield from self._do_get_result()
+        return rows
+
+    @asyncio.coroutine
+    def load_rows(self, table, columns, rows):
+        """Bulk load rows with LOAD DATA LOCAL INFILE from memory
+
+        Rows are taken from a sequence, iterator or asynchronous iterable
+        and streamed to the server as tab separated data under a virtual
+        file name, nothing is written to disk. The connection has to be
+        created with ``local_infile=True``.
+
+        Example:
+
+            data = [('Jane', '555-001'), ('Joe', '555-001')]
+            yield from cursor.load_rows('employees', ('name', 'phone'),
+                                        data)
+
+        Note, if *rows* raises during loading, rows sent before the error
+        are still loaded unless the transaction is rolled back.
+
+        :param table: ``str``, name of table to load data to
+        :param columns: sequence of column names, one per row item
+        :param rows: (async) iterable of rows
+        :returns: ``int``, number of loaded rows
+        """
+        conn = self._get_db()
+        if not conn.client_flag & CLIENT.LOCAL_FILES:
+            raise ProgrammingError("load_rows() requires connection created "
+                                   "with local_infile=True")
+        name = conn._register_local_rows(rows)
+        try:
+            sql = ("LOAD DATA LOCAL INFILE %s INTO TABLE %s "
+                   "CHARACTER SET %s (%s)" % (
+                       conn.escape(name), _quote_identifier(table),
+                       conn.charset,
+                       ', '.join(_quote_identifier(c) for c in columns)))
+            return (yield from self.execute(sql))
+        finally:
+            conn._unregister_local_rows(name)
+
     @asyncio.coroutine
     def callproc(self, procname, args=()):
         """Execute stored procedure procname with args
@@ -368,18 +598,22 @@ class Cursor:
 
     def fetchone(self):
         """Fetch the next row """
-        self._check_executed()
         fut = create_future(self._loop)
+        fut.set_result(self.fetchone_nowait())
+        return fut
 
+    def fetchone_nowait(self):
+        """Fetch the next row of a buffered result without returning a
+        future.
+
+        :returns: row or ``None`` when no more rows are available
+        """
+        self._check_executed()
         if self._rows is None or self._rownumber >= len(self._rows):
-            fut.set_result(None)
-            return fut
+            return None
         result = self._rows[self._rownumber]
         self._rownumber += 1
-
-        fut = create_future(self._loop)
-        fut.set_result(result)
-        return fut
+        return result
 
     def fetchmany(self, size=None):
         """Returns the next set of rows of a query result, returning a
@@ -392,37 +626,55 @@ class Cursor:
         :param size: ``int`` number of rows to return
         :returns: ``list`` of fetched rows
         """
-        self._check_executed()
         fut = create_future(self._loop)
+        fut.set_result(self.fetchmany_nowait(size))
+        return fut
+
+    def fetchmany_nowait(self, size=None):
+        """Same as :meth:`fetchmany` for buffered results, but returns
+        rows instead of a future.
+
+        :param size: ``int`` number of rows to return
+        :returns: ``list`` of fetched rows
+        """
+        self._check_executed()
         if self._rows is None:
-            fut.set_result([])
-            return fut
+            return []
         end = self._rownumber + (size or self._arraysize)
         result = self._rows[self._rownumber:end]
         self._rownumber = min(end, len(self._rows))
-
-        fut.set_result(result)
-        return fut
+        return result
 
     def fetchall(self):
         """Returns all rows of a query result set
 
         :returns: ``list`` of fetched rows
         """
-        self._check_executed()
         fut = create_future(self._loop)
+        fut.set_result(self.fetchall_nowait())
+        return fut
+
+    def fetchall_nowait(self):
+        """Same as :meth:`fetchall` for buffered results, but returns
+        rows instead of a future.
+
+        :returns: ``list`` of fetched rows
+        """
+        self._check_executed()
         if self._rows is None:
-            fut.set_result([])
-            return fut
+            return []
 
-        if self._rownumber:
+        if self._rownumber or isinstance(self._rows, SpilledRows):
+            # spilled rows are read into list, their file is closed by
+            # the next execute() while caller may still hold the rows
             result = self._rows[self._rownumber:]
         else:
             result = self._rows
         self._rownumber = len(self._rows)
+        return result
 
-        fut.set_result(result)
-        return fut
+    def __iter__(self):
+        return iter(self.fetchone_nowait, None)
 
     def scroll(self, value, mode='relative'):
         """Scroll the cursor in the result set to a new position according
@@ -458,7 +710,7 @@ class Cursor:
     def _query(self, q):
         conn = self._get_db()
         self._last_executed = q
-        yield from conn.query(q)
+        yield from conn.query(q, row_builder=self._row_builder)
         yield from self._do_get_result()
 
     @asyncio.coroutine
@@ -469,6 +721,7 @@ class Cursor:
         self._rowcount = result.affected_rows
         self._description = result.description
         self._lastrowid = result.insert_id
+        self._close_rows()
         self._rows = result.rows
 
         if result.warning_count > 0:
@@ -503,7 +756,7 @@ class Cursor:
 
         @asyncio.coroutine
         def __anext__(self):
-            ret = yield from self.fetchone()
+            ret = self.fetchone_nowait()
             if ret is not None:
                 return ret
             else:
@@ -519,28 +772,81 @@ class Cursor:
             return
 
 
+def _quote_identifier(name):
+    return '.'.join('`%s`' % part.replace('`', '``')
+                    for part in name.split('.'))
+
+
+@asyncio.coroutine
+def _aiter_args(args):
+    """Return iterator over *args* and flag telling if it is asynchronous"""
+    if PY_35 and hasattr(args, '__aiter__'):
+        it = args.__aiter__()
+        if not hasattr(it, '__anext__'):
+            # before python 3.5.2 __aiter__ was allowed to be a coroutine
+            it = yield from it
+        return it, True
+    return iter(args), False
+
+
+@asyncio.coroutine
+def _take_args(it, is_async, size):
+    """Read up to *size* items from a sync or async iterator"""
+    if not is_async:
+        return list(itertools.islice(it, size))
+    items = []
+    while len(items) < size:
+        try:
+            item = yield from it.__anext__()
+        except StopAsyncIteration:  # noqa
+            break
+        items.append(item)
+    return items
+
+
+def _convert_rows(rows, conv):
+    """Apply *conv* to buffered rows, lazily for rows spilled to disk"""
+    if isinstance(rows, SpilledRows):
+        return rows.converted(conv)
+    return [conv(r) for r in rows]
+
+
+def _field_names(fields):
+    """Column names of a result, duplicates prefixed with table name"""
+    names = []
+    for f in fields:
+        name = f.name
+        if name in names:
+            name = f.table_name + '.' + name
+        names.append(name)
+    return names
+
+
 class _DictCursorMixin:
     # You can override this to use OrderedDict or other dict-like types.
+    # With a DictRow subclass all rows share one table of keys.
     dict_type = dict
 
+    _key_table = None
+
     @asyncio.coroutine
     def _do_get_result(self):
         yield from super()._do_get_result()
         fields = []
         if self._description:
-            for f in self._result.fields:
-                name = f.name
-                if name in fields:
-                    name = f.table_name + '.' + name
-                fields.append(name)
+            fields = _field_names(self._result.fields)
             self._fields = fields
+            if issubclass(self.dict_type, DictRow):
+                self._key_table = self.dict_type.key_table(fields)
 
         if fields and self._rows:
-            self._rows = [self._conv_row(r) for r in self._rows]
+            self._rows = _convert_rows(self._rows, self._conv_row)
 
     def _conv_row(self, row):
         if row is None:
             return None
+        if self._key_table is not None:
+            return self.dict_type(self._key_table, row)
         return self.dict_type(zip(self._fields, row))
 
 
@@ -548,6 +854,195 @@ class DictCursor(_DictCursorMixin, Cursor):
     """A cursor which returns results as a dictionary"""
 
 
+@functools.lru_cache(maxsize=128)
+def _namedtuple_class(names):
+    """Row class for column *names*, shared by all results with the same
+    columns. Names which are not valid identifiers are replaced by their
+    position, ``_1`` for the second column for example."""
+    return collections.namedtuple('Row', names, rename=True)
+
+
+class _NamedTupleCursorMixin:
+
+    @asyncio.coroutine
+    def _do_get_result(self):
+        yield from super()._do_get_result()
+        if self._description:
+            names = tuple(_field_names(self._result.fields))
+            self._row_class = _namedtuple_class(names)
+
+        if self._description and self._rows:
+            self._rows = _convert_rows(self._rows, self._conv_row)
+
+    def _conv_row(self, row):
+        if row is None:
+            return None
+        return self._row_class._make(row)
+
+
+class NamedTupleCursor(_NamedTupleCursorMixin, Cursor):
+    """A cursor which returns results as named tuples"""
+
+
+class ColumnarCursor(Cursor):
+    """A buffered cursor which stores results column by column.
+
+    Integer and float columns are decoded into :class:`array.array`,
+    binary columns into a :class:`~aiomysql.columnar.BlobColumn` and other
+    columns into lists, no tuple is kept per row. Rows fetched with the
+    usual fetch methods are built on access.
+    """
+
+    _row_builder = ColumnarBuilder
+
+    def fetchcolumns(self):
+        """Returns all columns of the current result set
+
+        :returns: ``dict`` mapping column name to its values
+        """
+        self._check_executed()
+        fut = create_future(self._loop)
+        if self._rows is None:
+            fut.set_result({})
+            return fut
+        self._rownumber = len(self._rows)
+        names = _field_names(self._result.fields)
+        fut.set_result(dict(zip(names, self._rows.columns)))
+        return fut
+
+    @property
+    def null_masks(self):
+        """NULL masks of the current result set, ``dict`` mapping column
+        name to ``bytearray`` with ``1`` for each NULL row. Columns without
+        NULL values are left out."""
+        if self._rows is None:
+            return {}
+        names = _field_names(self._result.fields)
+        return {name: mask for name, mask in zip(names, self._rows.null_masks)
+                if mask is not None}
+
+    def fetch_numpy(self):
+        """Returns all columns of the current result set as numpy arrays,
+        numpy is imported on first use.
+
+        Columns holding NULL values are returned as
+        :class:`numpy.ma.MaskedArray`.
+
+        :returns: ``dict`` mapping column name to ``numpy.ndarray``
+        """
+        self._check_executed()
+        fut = create_future(self._loop)
+        if self._rows is None:
+            fut.set_result({})
+            return fut
+        self._rownumber = len(self._rows)
+        names = _field_names(self._result.fields)
+        arrays = to_numpy(self._result.fields, self._rows)
+        fut.set_result(dict(zip(names, arrays)))
+        return fut
+
+    def fetch_structured(self):
+        """Returns the current result set as one numpy structured array,
+        masked if any column holds NULL values.
+
+        :returns: ``numpy.ndarray`` or ``None`` if the query returned no
+            result set
+        """
+        self._check_executed()
+        fut = create_future(self._loop)
+        if self._rows is None:
+            fut.set_result(None)
+            return fut
+        self._rownumber = len(self._rows)
+        names = _field_names(self._result.fields)
+        arrays = to_numpy(self._result.fields, self._rows)
+        fut.set_result(to_structured(names, arrays))
+        return fut
+
+
+class LazyRowCursor(Cursor):
+    """A buffered cursor which returns :class:`~aiomysql.rows.LazyRow`
+    rows, a column is decoded and converted when it is accessed first.
+
+    Useful for wide results when only a few columns of each row are read.
+    """
+
+    _row_builder = LazyRowBuilder
+
+
+class PreparedCursor(Cursor):
+    """A buffered cursor which executes statements as server side prepared
+    statements.
+
+    ``%s`` and ``%(name)s`` placeholders are turned into ``?`` markers and
+    arguments are sent in the binary protocol without escaping, so big
+    ``bytes`` values, file objects and asynchronous iterables may be
+    passed and are streamed to the server. Statements are prepared once
+    and kept open by the connection.
+    """
+
+    # rows of prepared statements come in the binary protocol, statements
+    # sent as text by the inherited methods use _row_builder
+    _statement_row_builder = BinaryRowBuilder
+
+    @asyncio.coroutine
+    def execute(self, query, args=None):
+        """Executes the given operation as a prepared statement
+
+        :param query: ``str`` sql statement with ``%s`` or ``%(name)s``
+            placeholders
+        :param args: ``tuple``, ``list`` or ``dict`` of arguments
+        :returns: ``int``, number of rows that has been produced of affected
+        """
+        conn = self._get_db()
+
+        while (yield from self.nextset()):
+            pass
+
+        if args is None:
+            sql, params = query, ()
+        else:
+            template = conn.compile(query)
+            sql, params = template.marker_sql(), template.positional(args)
+
+        statement = yield from conn._prepare_cached(sql)
+        self._last_executed = sql
+        yield from statement.execute(
+            params, row_builder=self._statement_row_builder)
+        yield from self._do_get_result()
+        self._executed = query
+        if self._echo:
+            logger.info(query)
+            logger.info("%r", args)
+        return self._rowcount
+
+    @asyncio.coroutine
+    def executemany(self, query, args, *, commit_every=None, pipeline=0,
+                    batch_statements=False):
+        """Execute the prepared statement once for every item of *args*
+
+        :param query: ``str`` sql statement
+        :param args: ``tuple`` or ``list`` of arguments for sql query,
+            or (async) iterable producing them
+        :param commit_every: ``int``, commit after every *commit_every*
+            statements and after the last one
+        :param pipeline: not supported for prepared statements
+        :param batch_statements: not supported for prepared statements
+        """
+        if pipeline:
+            raise NotSupportedError(
+                "Prepared statements can not be pipelined")
+        if batch_statements:
+            raise NotSupportedError(
+                "Prepared statements can not be batched")
+        if not args:
+            return
+        if self._echo:
+            logger.info("CALL %s", query)
+            logger.info("%r", args)
+        return (yield from self._execute_each(query, args, commit_every))
+
+
 class SSCursor(Cursor):
     """Unbuffered Cursor, mainly useful for queries that return a lot of
     data, or for connections to remote servers over a slow network.
@@ -563,12 +1058,27 @@ class SSCursor(Cursor):
     possible to scroll backwards, as only the current row is held in memory.
     """
 
+    #: Number of rows :meth:`fetchall` reads per batch.
+    fetchall_batch_size = 1000
+
+    # weak reference to iterator of iter_batches() which may still read
+    # ahead, an abandoned iterator stops reading on its own
+    _batches = None
+
+    @asyncio.coroutine
+    def _close_batches(self):
+        batches = self._batches and self._batches()
+        self._batches = None
+        if batches is not None:
+            yield from batches.close()
+
     @asyncio.coroutine
     def close(self):
         conn = self._connection
         if conn is None:
             return
 
+        yield from self._close_batches()
         if self._result is not None and self._result is conn._result:
             yield from self._result._finish_unbuffered_query()
 
@@ -581,6 +1091,7 @@ class SSCursor(Cursor):
     @asyncio.coroutine
     def _query(self, q):
         conn = self._get_db()
+        yield from self._close_batches()
         self._last_executed = q
         yield from conn.query(q, unbuffered=True)
         yield from self._do_get_result()
@@ -610,10 +1121,10 @@ class SSCursor(Cursor):
         """
         rows = []
         while True:
-            row = yield from self.fetchone()
-            if row is None:
+            batch = yield from self.fetchmany(self.fetchall_batch_size)
+            if not batch:
                 break
-            rows.append(row)
+            rows.extend(batch)
         return rows
 
     @asyncio.coroutine
@@ -632,15 +1143,76 @@ class SSCursor(Cursor):
         if size is None:
             size = self._arraysize
 
-        rows = []
-        for i in range(size):
-            row = yield from self._read_next()
-            if row is None:
-                break
-            rows.append(row)
-            self._rownumber += 1
+        rows = yield from self._result._read_rowdata_packets_unbuffered(size)
+        rows = [self._conv_row(r) for r in rows]
+        self._rownumber += len(rows)
         return rows
 
+    @asyncio.coroutine
+    def stream_column(self, column, chunk_size=65536):
+        """Read the next row streaming the value of *column* in chunks
+
+        The value is not assembled in memory, chunks are returned while
+        its packets arrive, which suits piping big ``BLOB`` or ``TEXT``
+        values to a file or another service::
+
+            stream = yield from cursor.stream_column('data')
+            while stream is not None:
+                async for chunk in stream:
+                    f.write(chunk)
+                print(stream.row)
+                stream = yield from cursor.stream_column('data')
+
+        Without ``async for`` call ``yield from stream.read_chunk()``,
+        which returns ``b''`` at the end of the value. A partly read value
+        is skipped by the next fetch.
+
+        :param column: ``int`` index or ``str`` name of the column
+        :param chunk_size: ``int`` maximal size of a chunk
+        :returns: :class:`~aiomysql.streaming.ColumnStream`, or ``None``
+            when rows are exhausted
+        """
+        self._check_executed()
+        result = self._result
+        yield from result._close_stream()
+        if not result.unbuffered_active:
+            return None
+        if not isinstance(column, int):
+            column = [f.name for f in result.fields].index(column)
+        stream = ColumnStream(result, column, chunk_size, self._conv_row)
+        if not (yield from stream._start()):
+            return None
+        self._rownumber += 1
+        return stream
+
+    def iter_batches(self, size=None, prefetch=2):
+        """Iterate over batches of rows, reading next ones in background
+
+        While the consumer processes one batch, next batches are read and
+        decoded by a background task, so database reads overlap with
+        downstream I/O. At most *prefetch* batches are buffered ahead.
+
+            async for batch in cursor.iter_batches(1000):
+                await write_somewhere(batch)
+
+        Without ``async for`` call ``yield from batches.next_batch()``,
+        which returns empty list when rows are exhausted. Call ``close()``
+        of the iterator (or use it in ``async with``) when it is abandoned
+        early, otherwise it is closed by the next :meth:`execute` or
+        :meth:`close` of the cursor.
+
+        :param size: ``int`` number of rows per batch, defaults to
+            :attr:`arraysize`
+        :param prefetch: ``int`` number of batches read ahead
+        :returns: asynchronous iterator of ``list`` of rows
+        """
+        self._check_executed()
+        if prefetch < 1:
+            raise ValueError("prefetch should be greater than zero")
+        batches = _BatchIterator(self, size or self._arraysize, prefetch)
+        self._batches = weakref.ref(batches)
+        return batches
+
     @asyncio.coroutine
     def scroll(self, value, mode='relative'):
         """Scroll the cursor in the result set to a new position
@@ -675,6 +1247,266 @@ class SSCursor(Cursor):
         else:
             raise ProgrammingError("unknown scroll mode %s" % mode)
 
+    def fetchone_nowait(self):
+        raise NotSupportedError("Unbuffered cursor has to wait for rows")
+
+    def fetchmany_nowait(self, size=None):
+        raise NotSupportedError("Unbuffered cursor has to wait for rows")
+
+    def fetchall_nowait(self):
+        raise NotSupportedError("Unbuffered cursor has to wait for rows")
+
+    def __iter__(self):
+        raise NotSupportedError("Unbuffered cursor supports only async "
+                                "iteration")
+
+    if PY_35:  # pragma: no branch
+        @asyncio.coroutine
+        def __anext__(self):
+            ret = yield from self.fetchone()
+            if ret is not None:
+                return ret
+            else:
+                raise StopAsyncIteration  # noqa
+
+
+class _BatchReader:
+    """Background part of :class:`_BatchIterator`.
+
+    Kept apart from the iterator so the task does not reference it and
+    an abandoned iterator is collected, and its task stopped, right away.
+    """
+
+    def __init__(self, cursor, size, prefetch):
+        self.cursor = cursor
+        self.size = size
+        self.queue = asyncio.Queue(maxsize=prefetch, loop=cursor._loop)
+        self.reading = False
+        self.closing = False
+
+    @asyncio.coroutine
+    def read_ahead(self):
+        try:
+            while not self.closing:
+                self.reading = True
+                try:
+                    batch = yield from self.cursor.fetchmany(self.size)
+                finally:
+                    self.reading = False
+                if self.closing:
+                    break
+                yield from self.queue.put(batch)
+                if not batch:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            yield from self.queue.put(exc)
+
+    def stop(self, task):
+        self.closing = True
+        if not self.reading:
+            # waiting for free slot in queue, safe to interrupt
+            task.cancel()
+
+
+class _BatchIterator:
+    """Reads batches of rows of unbuffered cursor in background task.
+
+    At most *prefetch* batches are read ahead of the consumer.
+    """
+
+    def __init__(self, cursor, size, prefetch):
+        self._cursor = cursor
+        self._reader = _BatchReader(cursor, size, prefetch)
+        self._task = None
+        self._done = False
+
+    @asyncio.coroutine
+    def next_batch(self):
+        """Return next batch of rows or empty list when rows are exhausted"""
+        if self._done:
+            return []
+        if self._task is None:
+            self._task = create_task(self._reader.read_ahead(),
+                                     self._cursor._loop)
+        batch = yield from self._reader.queue.get()
+        if isinstance(batch, Exception):
+            self._done = True
+            raise batch
+        if not batch:
+            self._done = True
+        return batch
+
+    @asyncio.coroutine
+    def close(self):
+        """Stop reading ahead. Batches already read ahead, including one
+        being read, are dropped, rows the iterator has not fetched yet stay
+        in the cursor"""
+        self._done = True
+        task = self._task
+        if task is None or task.done():
+            self._reader.closing = True
+            return
+        self._reader.stop(task)
+        yield from asyncio.wait([task], loop=self._cursor._loop)
+
+    def __del__(self):
+        # abandoned without close(), do not leave the task pending
+        if self._task is not None and not self._task.done():
+            self._reader.stop(self._task)
+
+    if PY_35:  # pragma: no branch
+        def __aiter__(self):
+            return self
+
+        @asyncio.coroutine
+        def __anext__(self):
+            batch = yield from self.next_batch()
+            if batch:
+                return batch
+            else:
+                raise StopAsyncIteration  # noqa
+
+        @asyncio.coroutine
+        def __aenter__(self):
+            return self
+
+        @asyncio.coroutine
+        def __aexit__(self, exc_type, exc_val, exc_tb):
+            yield from self.close()
+
+
+class SSPreparedCursor(PreparedCursor, SSCursor):
+    """Unbuffered cursor which keeps rows in a read-only server side cursor
+    of a prepared statement.
+
+    Rows are fetched ``fetch_size`` at a time with ``COM_STMT_FETCH``,
+    the connection may run other statements in between. Closing the cursor
+    before the rows are exhausted just closes the statement on the server,
+    remaining rows are never transferred.
+    """
+
+    #: Number of rows fetched from the server per round trip.
+    fetch_size = 1000
+
+    def __init__(self, connection, echo=False):
+        super().__init__(connection, echo)
+        self._statement = None
+        self._readers = None
+        self._pending = collections.deque()
+        self._exhausted = True
+
+    @asyncio.coroutine
+    def close(self):
+        conn = self._connection
+        if conn is None:
+            return
+        try:
+            yield from self._close_batches()
+            if self._statement is not None and not conn.closed:
+                # closing the statement closes its server side cursor too
+                yield from self._statement.close()
+        finally:
+            self._statement = None
+            self._pending.clear()
+            self._connection = None
+
+    @asyncio.coroutine
+    def execute(self, query, args=None):
+        """Executes the given operation as a prepared statement, rows of
+        the result stay on the server until they are fetched
+
+        :param query: ``str`` sql statement with ``%s`` or ``%(name)s``
+            placeholders
+        :param args: ``tuple``, ``list`` or ``dict`` of arguments
+        :returns: ``int``, number of rows that has been produced of affected
+        """
+        conn = self._get_db()
+
+        if args is None:
+            sql, params = query, ()
+        else:
+            template = conn.compile(query)
+            sql, params = template.marker_sql(), template.positional(args)
+        if isinstance(sql, str):
+            sql = sql.encode(conn.encoding, 'surrogateescape')
+
+        yield from self._close_batches()
+        statement = self._statement
+        if statement is not None and statement.sql != sql:
+            self._statement = None
+            yield from statement.close()
+            statement = None
+        elif statement is not None and not self._exhausted:
+            yield from statement.reset()
+        if statement is None:
+            statement = self._statement = yield from conn.prepare(sql)
+
+        self._pending.clear()
+        self._exhausted = True
+        self._last_executed = sql
+        yield from statement.execute(
+            params, row_builder=self._statement_row_builder,
+            cursor_type=CURSOR_TYPE_READ_ONLY)
+        yield from self._do_get_result()
+        result = self._result
+        if result.cursor_exists:
+            self._readers = column_readers(result)
+            self._exhausted = False
+            # number of rows is not known, like for SSCursor
+            self._rowcount = 18446744073709551615
+        elif result.rows:
+            self._pending.extend(result.rows)
+        self._rows = None
+        self._executed = query
+        if self._echo:
+            logger.info(query)
+            logger.info("%r", args)
+        return self._rowcount
+
+    @asyncio.coroutine
+    def _fill(self, size):
+        while len(self._pending) < size and not self._exhausted:
+            rows, self._exhausted = yield from self._statement.fetch(
+                self.fetch_size, self._readers)
+            self._pending.extend(rows)
+
+    @asyncio.coroutine
+    def _read_next(self):
+        """Read next row """
+        yield from self._fill(1)
+        if not self._pending:
+            return None
+        return self._conv_row(self._pending.popleft())
+
+    @asyncio.coroutine
+    def fetchmany(self, size=None):
+        """Returns the next set of rows of a query result, fetching them
+        from the server in chunks of :attr:`fetch_size` rows.
+
+        :param size: ``int`` number of rows to return
+        :returns: ``list`` of fetched rows
+        """
+        self._check_executed()
+        if size is None:
+            size = self._arraysize
+        yield from self._fill(size)
+        pending = self._pending
+        rows = [self._conv_row(pending.popleft())
+                for _ in range(min(size, len(pending)))]
+        self._rownumber += len(rows)
+        return rows
+
+    @asyncio.coroutine
+    def stream_column(self, column, chunk_size=65536):
+        raise NotSupportedError(
+            "Server side cursors can not stream column values")
+
 
 class SSDictCursor(_DictCursorMixin, SSCursor):
     """An unbuffered cursor, which returns results as a dictionary """
+
+
+class SSNamedTupleCursor(_NamedTupleCursorMixin, SSCursor):
+    """An unbuffered cursor, which returns results as named tuples"""
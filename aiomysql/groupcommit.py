@@ -0,0 +1,151 @@
+import asyncio
+import collections
+
+from .utils import create_future, create_task
+
+
+class GroupCommitter:
+    """Merge small concurrent transactions into one shared transaction.
+
+    Every submitted unit of work is a coroutine function that receives a
+    cursor. Queued units are executed back to back on a single pooled
+    connection inside one ``BEGIN``/``COMMIT``, each unit wrapped in its
+    own ``SAVEPOINT``. A unit that raises is rolled back to its savepoint
+    only, the other units of the group are still committed.
+
+        committer = GroupCommitter(pool)
+
+        @asyncio.coroutine
+        def transfer(cur, src, dst, amount):
+            yield from cur.execute(
+                "UPDATE acc SET v = v - %s WHERE id = %s", (amount, src))
+            yield from cur.execute(
+                "UPDATE acc SET v = v + %s WHERE id = %s", (amount, dst))
+
+        yield from committer.run(transfer, 1, 2, 10)
+
+    Units must not commit or roll back the transaction themselves. If the
+    shared transaction itself fails (for example on deadlock, when the
+    server discards all savepoints) every unit of the group gets the
+    error.
+    """
+
+    def __init__(self, pool, max_batch=100, max_delay=0.002, loop=None):
+        if max_batch < 1:
+            raise ValueError("max_batch should be greater than zero")
+        self._pool = pool
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._loop = loop or asyncio.get_event_loop()
+        self._pending = collections.deque()
+        self._task = None
+        self._closing = False
+
+    @property
+    def max_batch(self):
+        """Maximum number of units committed by one transaction."""
+        return self._max_batch
+
+    @property
+    def max_delay(self):
+        """Seconds to wait for more units before starting a group."""
+        return self._max_delay
+
+    @property
+    def pending(self):
+        """Number of queued units that are not started yet."""
+        return len(self._pending)
+
+    def submit(self, func, *args):
+        """Queue ``func(cursor, *args)`` for the next group.
+
+        Returns future with the result of the unit, resolved only after
+        the group transaction is committed.
+        """
+        if self._closing:
+            raise RuntimeError("Cannot submit work after closing committer")
+        fut = create_future(self._loop)
+        self._pending.append((func, args, fut))
+        if self._task is None:
+            self._task = create_task(self._flush(), self._loop)
+        return fut
+
+    @asyncio.coroutine
+    def run(self, func, *args):
+        """Submit unit of work and wait for its commit."""
+        return (yield from self.submit(func, *args))
+
+    @asyncio.coroutine
+    def close(self):
+        """Stop accepting work and wait for queued units to commit."""
+        self._closing = True
+        if self._task is not None:
+            yield from asyncio.wait([self._task], loop=self._loop)
+
+    @asyncio.coroutine
+    def _flush(self):
+        try:
+            while self._pending:
+                if len(self._pending) < self._max_batch and self._max_delay:
+                    # give concurrent producers a chance to join the group
+                    yield from asyncio.sleep(self._max_delay, loop=self._loop)
+                units = []
+                while self._pending and len(units) < self._max_batch:
+                    units.append(self._pending.popleft())
+                yield from self._commit_group(units)
+        finally:
+            self._task = None
+
+    @asyncio.coroutine
+    def _commit_group(self, units):
+        done = []
+        try:
+            conn = yield from self._pool.acquire()
+        except Exception as exc:
+            _fail_units(units, exc)
+            return
+        try:
+            yield from conn.begin()
+            for seq, (func, args, fut) in enumerate(units):
+                if fut.cancelled():
+                    continue
+                result = yield from self._run_unit(conn, seq, func, args, fut)
+                if not fut.done():
+                    done.append((fut, result))
+            yield from conn.commit()
+        except Exception as exc:
+            try:
+                yield from conn.rollback()
+            except Exception:
+                conn.close()
+            _fail_units(units, exc)
+        else:
+            for fut, result in done:
+                if not fut.done():
+                    fut.set_result(result)
+        finally:
+            yield from self._pool.release(conn)
+
+    @asyncio.coroutine
+    def _run_unit(self, conn, seq, func, args, fut):
+        name = 'aiomysql_group_savepoint_%s' % seq
+        cur = yield from conn.cursor()
+        try:
+            yield from cur.execute('SAVEPOINT ' + name)
+            try:
+                result = yield from func(cur, *args)
+            except Exception as exc:
+                yield from cur.execute('ROLLBACK TO SAVEPOINT ' + name)
+                if not fut.done():
+                    fut.set_exception(exc)
+                return None
+            yield from cur.execute('RELEASE SAVEPOINT ' + name)
+            return result
+        finally:
+            yield from cur.close()
+
+
+def _fail_units(units, exc):
+    for _, _, fut in units:
+        if not fut.done():
+            fut.set_exception(exc)
@@ -0,0 +1,520 @@
+"""Server side prepared statements and the binary protocol of MySQL.
+
+http://dev.mysql.com/doc/internals/en/prepared-statements.html
+"""
+import asyncio
+import datetime
+import functools
+import io
+import struct
+from decimal import Decimal
+
+from pymysql.connections import EOFPacketWrapper
+from pymysql.constants import COMMAND, FIELD_TYPE, FLAG, SERVER_STATUS
+from pymysql.err import ProgrammingError
+
+
+# flag set in the second byte of a parameter type
+_UNSIGNED_PARAM = 0x80
+
+#: Flag of COM_STMT_EXECUTE opening a read-only server side cursor
+CURSOR_TYPE_READ_ONLY = 1
+
+_TINY = struct.Struct('<b')
+_UINT = struct.Struct('<I')
+_LONGLONG = struct.Struct('<q')
+_ULONGLONG = struct.Struct('<Q')
+_FLOAT = struct.Struct('<f')
+_DOUBLE = struct.Struct('<d')
+_DATE = struct.Struct('<HBB')
+_DATETIME = struct.Struct('<HBBBBB')
+_DATETIME_US = struct.Struct('<HBBBBBI')
+_TIME = struct.Struct('<BIBBB')
+_TIME_US = struct.Struct('<BIBBBI')
+
+
+def _lenenc(length):
+    if length < 251:
+        return bytes((length,))
+    if length < 1 << 16:
+        return b'\xfc' + struct.pack('<H', length)
+    if length < 1 << 24:
+        return b'\xfd' + struct.pack('<I', length)[:3]
+    return b'\xfe' + struct.pack('<Q', length)
+
+
+def _encode_none(value, encoding):
+    return FIELD_TYPE.NULL, 0, b''
+
+
+def _encode_bool(value, encoding):
+    return FIELD_TYPE.TINY, 0, _TINY.pack(value)
+
+
+def _encode_int(value, encoding):
+    if -1 << 63 <= value < 1 << 63:
+        return FIELD_TYPE.LONGLONG, 0, _LONGLONG.pack(value)
+    if 0 <= value < 1 << 64:
+        return FIELD_TYPE.LONGLONG, _UNSIGNED_PARAM, _ULONGLONG.pack(value)
+    return _encode_decimal(value, encoding)
+
+
+def _encode_float(value, encoding):
+    return FIELD_TYPE.DOUBLE, 0, _DOUBLE.pack(value)
+
+
+def _encode_decimal(value, encoding):
+    data = str(value).encode('ascii')
+    return FIELD_TYPE.NEWDECIMAL, 0, _lenenc(len(data)) + data
+
+
+def _encode_str(value, encoding):
+    data = value.encode(encoding, 'surrogateescape')
+    return FIELD_TYPE.VAR_STRING, 0, _lenenc(len(data)) + data
+
+
+def _encode_bytes(value, encoding):
+    return FIELD_TYPE.BLOB, 0, _lenenc(len(value)) + value
+
+
+def _encode_datetime(value, encoding):
+    if value.microsecond:
+        data = b'\x0b' + _DATETIME_US.pack(
+            value.year, value.month, value.day, value.hour, value.minute,
+            value.second, value.microsecond)
+    else:
+        data = b'\x07' + _DATETIME.pack(
+            value.year, value.month, value.day, value.hour, value.minute,
+            value.second)
+    return FIELD_TYPE.DATETIME, 0, data
+
+
+def _encode_date(value, encoding):
+    return (FIELD_TYPE.DATE, 0,
+            b'\x04' + _DATE.pack(value.year, value.month, value.day))
+
+
+def _encode_timedelta(value, encoding):
+    negative = value < datetime.timedelta(0)
+    if negative:
+        value = -value
+    hours, seconds = divmod(value.seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if value.microseconds:
+        data = b'\x0c' + _TIME_US.pack(negative, value.days, hours, minutes,
+                                       seconds, value.microseconds)
+    else:
+        data = b'\x08' + _TIME.pack(negative, value.days, hours, minutes,
+                                    seconds)
+    return FIELD_TYPE.TIME, 0, data
+
+
+def _encode_time(value, encoding):
+    return _encode_timedelta(datetime.timedelta(
+        hours=value.hour, minutes=value.minute, seconds=value.second,
+        microseconds=value.microsecond), encoding)
+
+
+_PARAM_ENCODERS = {
+    type(None): _encode_none,
+    bool: _encode_bool,
+    int: _encode_int,
+    float: _encode_float,
+    Decimal: _encode_decimal,
+    str: _encode_str,
+    bytes: _encode_bytes,
+    bytearray: _encode_bytes,
+    memoryview: _encode_bytes,
+    datetime.datetime: _encode_datetime,
+    datetime.date: _encode_date,
+    datetime.timedelta: _encode_timedelta,
+    datetime.time: _encode_time,
+}
+
+
+def _param_encoder(value_type):
+    for base in value_type.__mro__:
+        encoder = _PARAM_ENCODERS.get(base)
+        if encoder is not None:
+            _PARAM_ENCODERS[value_type] = encoder
+            return encoder
+    raise ProgrammingError(
+        "Unsupported prepared statement parameter type %r" % value_type)
+
+
+def _is_long_data(value, threshold):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value) >= threshold
+    return hasattr(value, 'read') or hasattr(value, '__aiter__')
+
+
+class PreparedStatement(object):
+    """Statement prepared on the server, parameters are marked with ``?``.
+
+    Parameters are sent in the binary protocol, no value is escaped.
+    ``bytes`` parameters of ``long_data_threshold`` bytes or more, file
+    objects and asynchronous iterables are streamed to the server in
+    chunks of ``long_data_chunk_size`` bytes before the statement is
+    executed.
+
+    Do not create instances yourself, use :meth:`Connection.prepare`.
+    """
+
+    #: Bytes parameters of this size or bigger are streamed to the server.
+    long_data_threshold = 1 << 20
+
+    #: Size of chunks long data parameters are sent in.
+    long_data_chunk_size = 1 << 20
+
+    def __init__(self, connection, statement_id, sql, param_count, fields):
+        self._connection = connection
+        self._statement_id = statement_id
+        self._sql = sql
+        self._param_count = param_count
+        self._fields = fields
+
+    @property
+    def statement_id(self):
+        """Handler of the statement on the server."""
+        return self._statement_id
+
+    @property
+    def sql(self):
+        """Statement text as sent to the server."""
+        return self._sql
+
+    @property
+    def param_count(self):
+        """Number of ``?`` markers of the statement."""
+        return self._param_count
+
+    @property
+    def fields(self):
+        """Descriptors of the columns the statement returns."""
+        return self._fields
+
+    @property
+    def closed(self):
+        return self._connection is None
+
+    @asyncio.coroutine
+    def execute(self, args=(), row_builder=None, cursor_type=0):
+        """Execute the statement with *args* and read its result into the
+        connection, like :meth:`Connection.query` does.
+
+        :param args: sequence of ``param_count`` parameters
+        :param row_builder: builder of result rows, by default rows are
+            decoded into tuples
+        :param cursor_type: :data:`CURSOR_TYPE_READ_ONLY` keeps rows of
+            the result in a server side cursor, read them with
+            :meth:`fetch`
+        :returns: number of affected rows
+        """
+        conn = self._get_connection()
+        if len(args) != self._param_count:
+            raise ProgrammingError(
+                "Statement takes %d parameters, %d given" %
+                (self._param_count, len(args)))
+
+        null_bitmap = bytearray((len(args) + 7) // 8)
+        types = []
+        values = []
+        long_data = []
+        encoding = conn.encoding
+        for i, value in enumerate(args):
+            if value is None:
+                null_bitmap[i // 8] |= 1 << (i % 8)
+            if _is_long_data(value, self.long_data_threshold):
+                if isinstance(value, io.TextIOBase):
+                    types.append(struct.pack('<BB', FIELD_TYPE.VAR_STRING, 0))
+                else:
+                    types.append(struct.pack('<BB', FIELD_TYPE.BLOB, 0))
+                long_data.append((i, value))
+                continue
+            encoder = _PARAM_ENCODERS.get(type(value))
+            if encoder is None:
+                encoder = _param_encoder(type(value))
+            type_code, flags, data = encoder(value, encoding)
+            types.append(struct.pack('<BB', type_code, flags))
+            values.append(data)
+
+        try:
+            for param_id, value in long_data:
+                yield from self._send_long_data(conn, param_id, value)
+        except Exception:
+            # the server keeps chunks sent so far and would prepend them to
+            # the parameter of the next execution
+            if not conn.closed:
+                yield from self.reset()
+            raise
+
+        # no cursor, one iteration
+        packet = [struct.pack('<IBI', self._statement_id, cursor_type, 1)]
+        if args:
+            packet.append(null_bitmap)
+            packet.append(b'\x01')
+            packet.extend(types)
+            packet.extend(values)
+        yield from conn._execute_command(COMMAND.COM_STMT_EXECUTE,
+                                         b''.join(packet))
+        if row_builder is None:
+            row_builder = BinaryRowBuilder
+        yield from conn._read_query_result(row_builder=row_builder)
+        return conn._affected_rows
+
+    @asyncio.coroutine
+    def _send_long_data(self, conn, param_id, value):
+        chunk_size = self.long_data_chunk_size
+        encoding = conn.encoding
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            view = memoryview(value)
+            for offset in range(0, len(view), chunk_size):
+                yield from conn._send_long_data(
+                    self._statement_id, param_id,
+                    view[offset:offset + chunk_size])
+            return
+
+        if hasattr(value, 'read'):
+            read = value.read
+            if asyncio.iscoroutinefunction(read):
+                next_chunk = read
+            else:
+                def next_chunk(size):
+                    return conn._loop.run_in_executor(None, read, size)
+        else:
+            it = value.__aiter__()
+            if not hasattr(it, '__anext__'):
+                # before python 3.5.2 __aiter__ was allowed to be a coroutine
+                it = yield from it
+
+            @asyncio.coroutine
+            def next_chunk(size):
+                try:
+                    return (yield from it.__anext__())
+                except StopAsyncIteration:  # noqa
+                    return b''
+
+        while True:
+            chunk = yield from next_chunk(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode(encoding, 'surrogateescape')
+            yield from conn._send_long_data(self._statement_id, param_id,
+                                            chunk)
+
+    @asyncio.coroutine
+    def fetch(self, count, readers):
+        """Fetch up to *count* rows from the server side cursor opened by
+        :meth:`execute`, decoding them with *readers* of
+        :func:`column_readers`.
+
+        :returns: list of rows and flag telling if the cursor is exhausted
+        """
+        conn = self._get_connection()
+        yield from conn._execute_command(
+            COMMAND.COM_STMT_FETCH,
+            struct.pack('<II', self._statement_id, count))
+        rows = []
+        while True:
+            packet = yield from conn._read_packet()
+            if packet.is_eof_packet():
+                status = EOFPacketWrapper(packet).server_status
+                return rows, bool(
+                    status & SERVER_STATUS.SERVER_STATUS_LAST_ROW_SENT)
+            rows.append(read_binary_row(packet.get_all_data(), readers))
+
+    @asyncio.coroutine
+    def reset(self):
+        """Close the server side cursor and drop long data sent to the
+        statement."""
+        conn = self._get_connection()
+        yield from conn._execute_command(
+            COMMAND.COM_STMT_RESET, struct.pack('<I', self._statement_id))
+        yield from conn._read_ok_packet()
+
+    @asyncio.coroutine
+    def close(self):
+        """Deallocate the statement on the server."""
+        conn = self._connection
+        if conn is None:
+            return
+        self._connection = None
+        if not conn.closed:
+            yield from conn._execute_command(
+                COMMAND.COM_STMT_CLOSE, struct.pack('<I', self._statement_id))
+
+    def _get_connection(self):
+        if self._connection is None:
+            raise ProgrammingError("Prepared statement closed")
+        return self._connection
+
+
+def _shortest_float(value):
+    # FLOAT columns are sent as single precision, use the shortest text
+    # which reads back as the same single, like the text protocol does
+    packed = _FLOAT.pack(value)
+    for precision in range(6, 9):
+        candidate = float('%.*g' % (precision, value))
+        if _FLOAT.pack(candidate) == packed:
+            return candidate
+    return value
+
+
+def _fixed_reader(fmt, size, convert=None):
+    unpack_from = struct.Struct(fmt).unpack_from
+
+    def read(data, pos):
+        value = unpack_from(data, pos)[0]
+        if convert is not None:
+            value = convert(value)
+        return value, pos + size
+    return read
+
+
+_INT_FORMATS = {
+    FIELD_TYPE.TINY: ('<b', '<B', 1),
+    FIELD_TYPE.SHORT: ('<h', '<H', 2),
+    FIELD_TYPE.YEAR: ('<h', '<H', 2),
+    FIELD_TYPE.INT24: ('<i', '<I', 4),
+    FIELD_TYPE.LONG: ('<i', '<I', 4),
+    FIELD_TYPE.LONGLONG: ('<q', '<Q', 8),
+}
+
+
+def _read_datetime(data, pos, converter=None):
+    length = data[pos]
+    pos += 1
+    parts = [0] * 7
+    if length >= 4:
+        parts[:3] = _DATE.unpack_from(data, pos)
+    if length >= 7:
+        parts[3:6] = data[pos + 4:pos + 7]
+    if length >= 11:
+        parts[6] = _UINT.unpack_from(data, pos + 7)[0]
+    try:
+        value = datetime.datetime(*parts)
+    except ValueError:
+        value = _zero_date('%04d-%02d-%02d %02d:%02d:%02d' % tuple(parts[:6]),
+                           converter)
+    return value, pos + length
+
+
+def _read_date(data, pos, converter=None):
+    length = data[pos]
+    parts = _DATE.unpack_from(data, pos + 1) if length else (0, 0, 0)
+    try:
+        value = datetime.date(*parts)
+    except ValueError:
+        value = _zero_date('%04d-%02d-%02d' % parts, converter)
+    return value, pos + 1 + length
+
+
+def _zero_date(text, converter):
+    # zero dates do not fit into datetime, give whatever the decoder of
+    # the connection gives for their text in the text protocol
+    if converter is not None:
+        return converter(text)
+    return text
+
+
+def _read_time(data, pos):
+    length = data[pos]
+    pos += 1
+    if not length:
+        return datetime.timedelta(0), pos
+    if length >= 12:
+        negative, days, hours, minutes, seconds, micro = \
+            _TIME_US.unpack_from(data, pos)
+    else:
+        negative, days, hours, minutes, seconds = \
+            _TIME.unpack_from(data, pos)
+        micro = 0
+    value = datetime.timedelta(days=days, hours=hours, minutes=minutes,
+                               seconds=seconds, microseconds=micro)
+    return -value if negative else value, pos + length
+
+
+def _string_reader(encoding, converter):
+    def read(data, pos):
+        length = data[pos]
+        if length < 251:
+            pos += 1
+        elif length == 252:
+            length = int.from_bytes(data[pos + 1:pos + 3], 'little')
+            pos += 3
+        elif length == 253:
+            length = int.from_bytes(data[pos + 1:pos + 4], 'little')
+            pos += 4
+        else:
+            length = int.from_bytes(data[pos + 1:pos + 9], 'little')
+            pos += 9
+        value = data[pos:pos + length]
+        if encoding is not None:
+            value = value.decode(encoding)
+        if converter is not None:
+            value = converter(value)
+        return value, pos + length
+    return read
+
+
+def _column_reader(field, encoding, converter):
+    type_code = field.type_code
+    if type_code in _INT_FORMATS:
+        signed, unsigned, size = _INT_FORMATS[type_code]
+        return _fixed_reader(unsigned if field.flags & FLAG.UNSIGNED
+                             else signed, size)
+    if type_code == FIELD_TYPE.FLOAT:
+        return _fixed_reader('<f', 4, _shortest_float)
+    if type_code == FIELD_TYPE.DOUBLE:
+        return _fixed_reader('<d', 8)
+    if type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+        return functools.partial(_read_datetime, converter=converter)
+    if type_code in (FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE):
+        return functools.partial(_read_date, converter=converter)
+    if type_code == FIELD_TYPE.TIME:
+        return _read_time
+    return _string_reader(encoding, converter)
+
+
+def column_readers(result):
+    """Binary protocol reader of every column of *result*"""
+    return [_column_reader(field, encoding, converter)
+            for field, (encoding, converter) in zip(result.fields,
+                                                    result.converters)]
+
+
+def read_binary_row(data, readers):
+    """Decode binary protocol row *data* with one reader per column"""
+    # header byte, then NULL bitmap with an offset of two bits
+    pos = 1 + (len(readers) + 9) // 8
+    row = []
+    for i, read in enumerate(readers):
+        bit = i + 2
+        if data[1 + bit // 8] & (1 << (bit % 8)):
+            row.append(None)
+        else:
+            value, pos = read(data, pos)
+            row.append(value)
+    return tuple(row)
+
+
+class BinaryRowBuilder(object):
+    """Decode binary protocol rows of a prepared statement result into
+    tuples.
+
+    Numbers and temporal values arrive as binary values and are returned
+    as is, other columns are decoded with the converters of the
+    connection.
+    """
+
+    def __init__(self, result):
+        self._readers = column_readers(result)
+        self._rows = []
+
+    def add_row(self, packet):
+        self._rows.append(read_binary_row(packet.get_all_data(),
+                                          self._readers))
+
+    def finish(self):
+        return tuple(self._rows)
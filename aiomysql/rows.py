@@ -0,0 +1,220 @@
+import sys
+from collections.abc import Mapping
+
+
+_NOT_DECODED = object()
+
+
+class LazyRow(object):
+    """Row which keeps the raw row data packet and decodes a column only
+    when it is accessed for the first time.
+
+    Behaves like a tuple of column values.
+    """
+
+    __slots__ = ('_data', '_converters', '_offsets', '_values')
+
+    def __init__(self, data, converters):
+        self._data = data
+        self._converters = converters
+        self._offsets = None
+        self._values = None
+
+    def _scan(self):
+        # find (start, end) of every column value, None for NULL
+        data = self._data
+        size = len(data)
+        pos = 0
+        offsets = []
+        for _ in self._converters:
+            if pos >= size:
+                # No more columns in this row
+                # See https://github.com/PyMySQL/PyMySQL/pull/434
+                break
+            c = data[pos]
+            if c == 251:
+                offsets.append(None)
+                pos += 1
+                continue
+            if c < 251:
+                length = c
+                pos += 1
+            elif c == 252:
+                length = int.from_bytes(data[pos + 1:pos + 3], 'little')
+                pos += 3
+            elif c == 253:
+                length = int.from_bytes(data[pos + 1:pos + 4], 'little')
+                pos += 4
+            else:
+                length = int.from_bytes(data[pos + 1:pos + 9], 'little')
+                pos += 9
+            offsets.append((pos, pos + length))
+            pos += length
+        self._offsets = offsets
+        self._values = [_NOT_DECODED] * len(offsets)
+
+    def _decode(self, index):
+        offset = self._offsets[index]
+        if offset is None:
+            value = None
+        else:
+            value = self._data[offset[0]:offset[1]]
+            encoding, converter = self._converters[index]
+            if encoding is not None:
+                value = value.decode(encoding)
+            if converter is not None:
+                value = converter(value)
+        self._values[index] = value
+        return value
+
+    def __len__(self):
+        if self._offsets is None:
+            self._scan()
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if self._offsets is None:
+            self._scan()
+        if isinstance(index, slice):
+            return tuple(self[i]
+                         for i in range(*index.indices(len(self._offsets))))
+        value = self._values[index]
+        if value is _NOT_DECODED:
+            if index < 0:
+                index += len(self._offsets)
+            value = self._decode(index)
+        return value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyRow, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return 'LazyRow%r' % (tuple(self),)
+
+
+class LazyRowBuilder(object):
+    """Keep row data packets of a result as :class:`LazyRow`."""
+
+    def __init__(self, result):
+        self._converters = result.converters
+        self._rows = []
+
+    def add_row(self, packet):
+        self._rows.append(LazyRow(packet.get_all_data(), self._converters))
+
+    def finish(self):
+        return tuple(self._rows)
+
+
+class DictRow(Mapping):
+    """Read-only mapping view over a row tuple.
+
+    All rows of a result share one *keys* table mapping column name to
+    position, so a row costs little more than its tuple. Use ``dict(row)``
+    where a real ``dict`` is needed. Set as ``dict_type`` of a
+    :class:`~aiomysql.DictCursor` subclass to use it.
+    """
+
+    __slots__ = ('_keys', '_row')
+
+    def __init__(self, keys, row):
+        self._keys = keys
+        self._row = row
+
+    @staticmethod
+    def key_table(names):
+        """Build the shared keys table for column *names*."""
+        return {sys.intern(name): i for i, name in enumerate(names)}
+
+    def __getitem__(self, key):
+        return self._row[self._keys[key]]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return 'DictRow(%r)' % (dict(self),)
+
+
+class SpilledRows(object):
+    """Read-only sequence of rows of a buffered result, rows past *head*
+    are kept as raw row data packets in temporary file *spill*.
+
+    ``offsets[i]:offsets[i + 1]`` is the position of spilled row ``i`` in
+    the file, *decode* turns its data into a row when the row is accessed.
+    """
+
+    __slots__ = ('_head', '_spill', '_offsets', '_decode', '_convert')
+
+    def __init__(self, head, spill, offsets, decode, convert=None):
+        self._head = head
+        self._spill = spill
+        self._offsets = offsets
+        self._decode = decode
+        self._convert = convert
+
+    def converted(self, convert):
+        """Same rows with *convert* applied to each row on access."""
+        return SpilledRows(self._head, self._spill, self._offsets,
+                           self._decode, convert)
+
+    def close(self):
+        self._spill.close()
+
+    def __len__(self):
+        return len(self._head) + len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._read(start, stop)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._read(index, index + 1)[0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _read(self, start, stop):
+        head = self._head
+        rows = list(head[start:stop])
+        start = max(start - len(head), 0)
+        stop = stop - len(head)
+        if start < stop:
+            offsets = self._offsets
+            # spilled rows are contiguous, read them with a single call
+            base = offsets[start]
+            self._spill.seek(base)
+            block = self._spill.read(offsets[stop] - base)
+            for i in range(start, stop):
+                rows.append(self._decode(
+                    block[offsets[i] - base:offsets[i + 1] - base]))
+        if self._convert is not None:
+            rows = [self._convert(row) for row in rows]
+        return rows
@@ -0,0 +1,217 @@
+import asyncio
+import struct
+
+from pymysql.connections import MAX_PACKET_LEN, MysqlPacket
+from pymysql.err import InternalError
+
+from .utils import PY_35
+
+
+class _PacketReader:
+    """Read one logical packet piece by piece, across the physical packets
+    of up to 16MB it is split into, without assembling it in memory."""
+
+    def __init__(self, connection):
+        self._conn = connection
+        self._left = 0
+        self._more = True
+        self._peeked = b''
+
+    @asyncio.coroutine
+    def next_packet(self):
+        """Read header of the next physical packet, return its length"""
+        conn = self._conn
+        header = yield from conn._read_bytes(4)
+        btrl, btrh, packet_number = struct.unpack('<HBB', header)
+        if packet_number != conn._next_seq_id:
+            raise InternalError(
+                "Packet sequence number wrong - got %d expected %d" %
+                (packet_number, conn._next_seq_id))
+        conn._next_seq_id = (conn._next_seq_id + 1) % 256
+        self._left = btrl + (btrh << 16)
+        self._more = self._left == MAX_PACKET_LEN
+        return self._left
+
+    def unread(self, data):
+        self._peeked = data + self._peeked
+
+    @asyncio.coroutine
+    def read_some(self, size):
+        """Read at least one and at most *size* bytes"""
+        if self._peeked:
+            data, self._peeked = self._peeked[:size], self._peeked[size:]
+            return data
+        while not self._left:
+            if not self._more:
+                raise InternalError("Row data packet ended unexpectedly")
+            yield from self.next_packet()
+        data = yield from self._conn._read_bytes(min(size, self._left))
+        self._left -= len(data)
+        return data
+
+    @asyncio.coroutine
+    def read(self, size):
+        """Read exactly *size* bytes"""
+        data = b''
+        while len(data) < size:
+            data += yield from self.read_some(size - len(data))
+        return data
+
+    @asyncio.coroutine
+    def read_length(self):
+        """Read length coded integer, ``None`` for NULL"""
+        c = (yield from self.read(1))[0]
+        if c < 251:
+            return c
+        if c == 251:
+            return None
+        size = {252: 2, 253: 3, 254: 8}[c]
+        return int.from_bytes((yield from self.read(size)), 'little')
+
+    @asyncio.coroutine
+    def read_value(self):
+        length = yield from self.read_length()
+        if length is None:
+            return None
+        return (yield from self.read(length))
+
+    @asyncio.coroutine
+    def finish(self):
+        """Skip whatever is left of the logical packet"""
+        while self._left or self._more:
+            if self._left:
+                data = yield from self._conn._read_bytes(self._left)
+                self._left -= len(data)
+            else:
+                yield from self.next_packet()
+
+
+def _decode_value(data, encoding, converter):
+    if data is not None:
+        if encoding is not None:
+            data = data.decode(encoding)
+        if converter is not None:
+            data = converter(data)
+    return data
+
+
+class ColumnStream:
+    """Value of one column of a row of an unbuffered result, read in
+    chunks while its packets arrive.
+
+    Chunks are raw ``bytes`` of the value, at most ``chunk_size`` each,
+    the value is never assembled in memory. Columns after the streamed one
+    are read when the value is exhausted, :attr:`row` is available from
+    then on.
+
+    Do not create instances yourself, use :meth:`SSCursor.stream_column`.
+    """
+
+    def __init__(self, result, column, chunk_size, convert=None):
+        self._result = result
+        self._column = column
+        self._chunk_size = chunk_size
+        self._convert = convert
+        self._reader = _PacketReader(result.connection)
+        self._values = []
+        self._length = None
+        self._remaining = 0
+        self._row = None
+
+    @property
+    def length(self):
+        """Length of the value in bytes, ``None`` for NULL."""
+        return self._length
+
+    @property
+    def row(self):
+        """The row with ``None`` in place of the streamed column, ``None``
+        until the value is read to its end."""
+        return self._row
+
+    @asyncio.coroutine
+    def _start(self):
+        """Read the row up to the streamed value, return ``False`` at the
+        end of the result."""
+        result = self._result
+        reader = self._reader
+        try:
+            length = yield from reader.next_packet()
+            first = yield from reader.read_some(1)
+            if first == b'\xfe' and length < 9 or first == b'\xff':
+                # EOF or error instead of a row
+                rest = yield from reader.read(length - 1)
+                packet = MysqlPacket(first + rest,
+                                     result.connection._encoding)
+                packet.check_error()
+                result._check_packet_is_eof(packet)
+                result.unbuffered_active = False
+                result.connection = None
+                result.rows = None
+                return False
+            reader.unread(first)
+            converters = result.converters
+            for encoding, converter in converters[:self._column]:
+                data = yield from reader.read_value()
+                self._values.append(_decode_value(data, encoding, converter))
+            self._length = yield from reader.read_length()
+            self._remaining = self._length or 0
+            if not self._remaining:
+                yield from self._finish_row()
+        except asyncio.CancelledError:
+            result.connection._close_on_cancel()
+            raise
+        result._stream = self
+        return True
+
+    @asyncio.coroutine
+    def _finish_row(self):
+        result = self._result
+        reader = self._reader
+        self._values.append(None)
+        for encoding, converter in result.converters[self._column + 1:]:
+            data = yield from reader.read_value()
+            self._values.append(_decode_value(data, encoding, converter))
+        yield from reader.finish()
+        row = tuple(self._values)
+        result.affected_rows = 1
+        result.rows = (row,)
+        if self._convert is not None:
+            row = self._convert(row)
+        self._row = row
+        if result._stream is self:
+            result._stream = None
+
+    @asyncio.coroutine
+    def read_chunk(self):
+        """Return next chunk of the value, ``b''`` when it is exhausted."""
+        if not self._remaining:
+            return b''
+        try:
+            data = yield from self._reader.read_some(
+                min(self._chunk_size, self._remaining))
+            self._remaining -= len(data)
+            if not self._remaining:
+                yield from self._finish_row()
+        except asyncio.CancelledError:
+            self._result.connection._close_on_cancel()
+            raise
+        return data
+
+    @asyncio.coroutine
+    def discard(self):
+        """Skip the rest of the value and read the rest of the row."""
+        while (yield from self.read_chunk()):
+            pass
+
+    if PY_35:  # pragma: no branch
+        def __aiter__(self):
+            return self
+
+        @asyncio.coroutine
+        def __anext__(self):
+            data = yield from self.read_chunk()
+            if data:
+                return data
+            else:
+                raise StopAsyncIteration  # noqa
@@ -0,0 +1,211 @@
+import re
+
+from pymysql.converters import (encoders, escape_dict, escape_sequence,
+                                escape_int, escape_None)
+from pymysql.err import ProgrammingError
+
+
+# %s, %(name)s and %%, anything else makes a template fall back to the
+# % operator
+_PLACEHOLDER = re.compile(r'%(?:\(([^()]*)\))?(.?)', re.DOTALL)
+
+
+# escapers of values which are not passed to a pymysql encoder directly
+_ESCAPE_STR, _ESCAPE_GENERIC = 'str', 'generic'
+
+
+def _escaper(value_type):
+    """Encoder for values of *value_type* giving the same result as
+    :meth:`Connection.escape`"""
+    if issubclass(value_type, str):
+        return _ESCAPE_STR
+    encoder = encoders.get(value_type)
+    if encoder is None or encoder in (escape_dict, escape_sequence):
+        return _ESCAPE_GENERIC
+    return encoder
+
+
+def _bytes_int(value, conn, encoding):
+    return b'%d' % value
+
+
+def _bytes_none(value, conn, encoding):
+    return b'NULL'
+
+
+def _bytes_str(value, conn, encoding):
+    return (b"'" + conn.escape_string(value).encode(encoding,
+                                                    'surrogateescape') +
+            b"'")
+
+
+def _bytes_generic(value, conn, encoding):
+    return conn.escape(value).encode(encoding, 'surrogateescape')
+
+
+def _bytes_escaper(value_type):
+    """Like :func:`_escaper` but the escaper returns encoded bytes, ints
+    and ``None`` skip the text step altogether"""
+    escaper = _escaper(value_type)
+    if escaper is _ESCAPE_STR:
+        return _bytes_str
+    if escaper is _ESCAPE_GENERIC:
+        return _bytes_generic
+    if value_type is int and escaper is escape_int:
+        return _bytes_int
+    if value_type is type(None) and escaper is escape_None:
+        return _bytes_none
+
+    def escape(value, conn, encoding):
+        return escaper(value, encoders).encode(encoding, 'surrogateescape')
+    return escape
+
+
+class QueryTemplate:
+    """SQL statement with ``%s`` or ``%(name)s`` placeholders parsed once.
+
+    The statement is split into literal segments and slots, rendering
+    escapes the arguments and joins them with the segments. Each slot
+    remembers the escape function for the type of its last value. The
+    output is the same as of ``sql % escaped_args``, statements with other
+    format specifications are rendered with the ``%`` operator.
+
+    Do not create instances yourself, use :meth:`Connection.compile`.
+    """
+
+    def __init__(self, sql):
+        self._sql = sql
+        self._literals = []
+        self._keys = []
+        self._named = False
+        self._generic = False
+        literal = []
+        pos = 0
+        for match in _PLACEHOLDER.finditer(sql):
+            name, conversion = match.groups()
+            literal.append(sql[pos:match.start()])
+            pos = match.end()
+            if conversion == '%' and name is None:
+                literal.append('%')
+            elif conversion == 's':
+                if self._keys and self._named != (name is not None):
+                    self._generic = True
+                self._named = name is not None
+                self._keys.append(name if self._named else len(self._keys))
+                self._literals.append(''.join(literal))
+                literal = []
+            else:
+                self._generic = True
+        literal.append(sql[pos:])
+        self._literals.append(''.join(literal))
+        self._types = [None] * len(self._keys)
+        self._escapers = [None] * len(self._keys)
+        self._columns = None
+
+    @property
+    def sql(self):
+        """Source statement of the template."""
+        return self._sql
+
+    def marker_sql(self):
+        """Return the statement with ``?`` markers in place of the slots,
+        for a prepared statement."""
+        if self._generic:
+            raise ProgrammingError(
+                "Only %s and %(name)s placeholders can be prepared")
+        return '?'.join(self._literals)
+
+    def positional(self, args):
+        """Return *args* as a list in the order of the slots."""
+        if isinstance(args, dict) != self._named:
+            raise TypeError("format requires a mapping" if self._named else
+                            "not all arguments converted during string "
+                            "formatting")
+        if not isinstance(args, (tuple, list, dict)):
+            args = (args,)
+        if not self._named and len(args) != len(self._keys):
+            raise TypeError("Statement takes %d arguments, %d given" %
+                            (len(self._keys), len(args)))
+        return [args[key] for key in self._keys]
+
+    def render(self, args, conn):
+        """Return the statement with escaped *args* of the same forms
+        :meth:`Cursor.execute` accepts."""
+        if self._generic:
+            return self._render_generic(args, conn)
+        if isinstance(args, (tuple, list)):
+            if self._named or len(args) != len(self._keys):
+                return self._render_generic(args, conn)
+        elif isinstance(args, dict):
+            if not self._named:
+                return self._render_generic(args, conn)
+        elif len(self._keys) == 1 and not self._named:
+            args = (args,)
+        else:
+            return self._render_generic(args, conn)
+
+        literals = self._literals
+        types = self._types
+        escapers = self._escapers
+        escape_string = conn.escape_string
+        parts = [literals[0]]
+        for i, key in enumerate(self._keys):
+            value = args[key]
+            if type(value) is not types[i]:
+                types[i] = type(value)
+                escapers[i] = _escaper(types[i])
+            escaper = escapers[i]
+            if escaper is _ESCAPE_STR:
+                parts.append("'" + escape_string(value) + "'")
+            elif escaper is _ESCAPE_GENERIC:
+                parts.append(conn.escape(value))
+            else:
+                parts.append(escaper(value, encoders))
+            parts.append(literals[i + 1])
+        return ''.join(parts)
+
+    def render_into(self, buf, args, conn, encoding):
+        """Append the statement rendered with *args* encoded to *encoding*
+        to bytearray *buf*.
+
+        Meant for many rows of the same shape: escapers are picked per
+        column from the types of the first row and write bytes straight
+        into *buf*, a value of another type is escaped by
+        :meth:`Connection.escape`. *args* which :meth:`render` would not
+        handle by slots go through :meth:`render` instead.
+        """
+        if self._generic or isinstance(args, dict) != self._named:
+            buf += self.render(args, conn).encode(encoding, 'surrogateescape')
+            return
+        if not isinstance(args, (tuple, list, dict)):
+            args = (args,)
+        if self._named:
+            args = [args[key] for key in self._keys]
+        elif len(args) != len(self._keys):
+            buf += self.render(args, conn).encode(encoding, 'surrogateescape')
+            return
+
+        if self._columns is None or self._columns[0] != encoding:
+            literals = [literal.encode(encoding, 'surrogateescape')
+                        for literal in self._literals]
+            types = [type(value) for value in args]
+            self._columns = (encoding, literals[0], list(zip(
+                types, map(_bytes_escaper, types), literals[1:])))
+        _, first, columns = self._columns
+        buf += first
+        for value, (value_type, escape, literal) in zip(args, columns):
+            if type(value) is value_type:
+                buf += escape(value, conn, encoding)
+            else:
+                buf += _bytes_generic(value, conn, encoding)
+            buf += literal
+
+    def _render_generic(self, args, conn):
+        if isinstance(args, (tuple, list)):
+            escaped = tuple(conn.escape(arg) for arg in args)
+        elif isinstance(args, dict):
+            escaped = dict((key, conn.escape(val))
+                           for (key, val) in args.items())
+        else:
+            escaped = conn.escape(args)
+        return self._sql % escaped
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from aiomysql import SSCursor
@@ -52,6 +54,83 @@ async def test_async_cursor_server_side(connection, table):
     assert [(1, 'a'), (2, 'b'), (3, 'c')] == ret
 
 
+@pytest.mark.run_loop
+async def test_async_iter_batches(connection, table):
+    ret = []
+    cursor = await connection.cursor(SSCursor)
+    await cursor.execute('SELECT * from tbl;')
+    async for batch in cursor.iter_batches(2, prefetch=1):
+        assert 0 < len(batch) <= 2
+        ret.extend(batch)
+    assert [(1, 'a'), (2, 'b'), (3, 'c')] == ret
+    await cursor.close()
+
+
+@pytest.mark.run_loop
+async def test_async_iter_batches_close_early(connection, table):
+    cursor = await connection.cursor(SSCursor)
+    await cursor.execute('SELECT * from tbl;')
+    async with cursor.iter_batches(1) as batches:
+        async for batch in batches:
+            assert [(1, 'a')] == batch
+            break
+    await cursor.close()
+    cursor = await connection.cursor()
+    await cursor.execute('SELECT 1;')
+    assert (1,) == await cursor.fetchone()
+
+
+@pytest.mark.run_loop
+async def test_async_iter_batches_abandoned(connection, table):
+    cursor = await connection.cursor(SSCursor)
+    await cursor.execute('SELECT * from tbl;')
+    batches = cursor.iter_batches(1)
+    assert [(1, 'a')] == await batches.next_batch()
+    # not closed, the next execute stops reading ahead
+    await cursor.execute('SELECT 1;')
+    assert batches._task.done()
+    assert (1,) == await cursor.fetchone()
+    await cursor.close()
+
+
+@pytest.mark.run_loop
+async def test_async_iter_batches_dropped(connection, table):
+    cursor = await connection.cursor(SSCursor)
+    await cursor.execute('SELECT * from tbl;')
+    batches = cursor.iter_batches(1)
+    assert [(1, 'a')] == await batches.next_batch()
+    task = batches._task
+    del batches
+    await asyncio.sleep(0.01)
+    assert task.done()
+    await cursor.close()
+
+
+class _AsyncRows:
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._rows)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.run_loop
+async def test_executemany_async_iterable(cursor, table):
+    rows = await cursor.executemany("INSERT INTO tbl VALUES(%s, %s)",
+                                    _AsyncRows([(4, 'd'), (5, 'e')]))
+    assert 2 == rows
+    await cursor.execute('SELECT * from tbl WHERE id > 3;')
+    ret = await cursor.fetchall()
+    assert [(4, 'd'), (5, 'e')] == list(ret)
+
+
 @pytest.mark.run_loop
 async def test_async_iter_over_sa_result(mysql_params, table, loop):
     ret = []
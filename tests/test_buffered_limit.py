@@ -0,0 +1,68 @@
+import pytest
+from aiomysql import DictCursor, OperationalError
+from aiomysql.rows import SpilledRows
+
+
+SQL = "SELECT %s AS n, REPEAT('x', 100) AS pad FROM DUAL" + \
+    " UNION ALL SELECT %s, REPEAT('x', 100) FROM DUAL" * 99
+
+
+@pytest.mark.run_loop
+def test_max_buffered_bytes_raise(connection_creator):
+    conn = yield from connection_creator(max_buffered_bytes=1000)
+    cur = yield from conn.cursor()
+    with pytest.raises(OperationalError) as ctx:
+        yield from cur.execute(SQL, list(range(100)))
+    assert 2008 == ctx.value.args[0]
+
+    # connection stays usable
+    yield from cur.execute("SELECT 1")
+    assert (1,) == (yield from cur.fetchone())
+
+
+@pytest.mark.run_loop
+def test_max_buffered_bytes_spill(connection_creator):
+    conn = yield from connection_creator(max_buffered_bytes=1000,
+                                         buffered_overflow='spill')
+    cur = yield from conn.cursor()
+    yield from cur.execute(SQL, list(range(100)))
+    assert isinstance(cur._rows, SpilledRows)
+    assert 100 == cur.rowcount
+    rows = yield from cur.fetchmany(5)
+    assert [0, 1, 2, 3, 4] == [r[0] for r in rows]
+    yield from cur.scroll(95, mode='absolute')
+    rows = yield from cur.fetchall()
+    assert [95, 96, 97, 98, 99] == [r[0] for r in rows]
+
+    cur = yield from conn.cursor(DictCursor)
+    yield from cur.execute(SQL, list(range(100)))
+    yield from cur.scroll(50, mode='absolute')
+    assert 50 == (yield from cur.fetchone())['n']
+
+    # the temporary file is closed by the next execute and by close
+    spill = cur._rows._spill
+    yield from cur.execute(SQL, list(range(100)))
+    assert spill.closed
+    spill = cur._rows._spill
+    yield from cur.close()
+    assert spill.closed
+
+
+@pytest.mark.run_loop
+def test_max_buffered_bytes_spill_fetchall(connection_creator):
+    conn = yield from connection_creator(max_buffered_bytes=1000,
+                                         buffered_overflow='spill')
+    cur = yield from conn.cursor()
+    yield from cur.execute(SQL, list(range(100)))
+    assert isinstance(cur._rows, SpilledRows)
+    rows = yield from cur.fetchall()
+    # rows fetched before next execute outlive its temporary file
+    yield from cur.execute(SQL, list(range(100)))
+    assert list(range(100)) == [r[0] for r in rows]
+    yield from cur.close()
+
+
+def test_buffered_overflow_invalid(connection_creator, loop):
+    with pytest.raises(ValueError):
+        loop.run_until_complete(
+            connection_creator(buffered_overflow='ignore'))
@@ -1,7 +1,7 @@
 import asyncio
 
 import pytest
-from aiomysql import DictCursor
+from aiomysql import DictCursor, IntegrityError
 
 
 @pytest.fixture
@@ -190,3 +190,123 @@ def test_bulk_insert_with_semicolon_at_the_end(cursor, table, assert_records):
     assert cursor._last_executed == expected
     yield from cursor.execute('commit')
     yield from assert_records(data)
+
+
+@pytest.mark.run_loop
+def test_bulk_insert_from_generator(cursor, table, assert_records):
+    data = [(i, "bob", 21, 123) for i in range(10)]
+    cursor.max_stmt_length = 100
+    rows = yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", (row for row in data), commit_every=2)
+    assert 10 == rows
+    yield from assert_records(data)
+
+
+@pytest.mark.run_loop
+def test_bulk_insert_from_empty_generator(cursor, table, assert_records):
+    rows = yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", iter([]))
+    # same as for an empty sequence
+    assert rows is None
+    rows = yield from cursor.executemany(
+        "UPDATE bulkinsert SET age = %s WHERE id = %s", iter([]))
+    assert rows is None
+    yield from assert_records([])
+
+
+@pytest.mark.run_loop
+def test_bulk_insert_pipelined(cursor, table, assert_records):
+    data = [(i, "bob", 21, 123) for i in range(50)]
+    cursor.max_stmt_length = 100
+    rows = yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", data, pipeline=3)
+    assert 50 == rows
+    assert 50 == cursor.rowcount
+    yield from cursor.execute('COMMIT')
+    yield from assert_records(data)
+
+
+@pytest.mark.run_loop
+def test_bulk_insert_pipelined_error(cursor, table, assert_records):
+    data = [(i, "bob", 21, 123) for i in range(10)]
+    cursor.max_stmt_length = 60
+    with pytest.raises(IntegrityError):
+        yield from cursor.executemany(
+            "INSERT INTO bulkinsert (id, name, age, height) "
+            "VALUES (%s,%s,%s,%s)", data + data, pipeline=2)
+    # connection is still usable after pipeline failure
+    yield from cursor.execute('SELECT 1')
+    assert (1,) == (yield from cursor.fetchone())
+    yield from cursor.execute('ROLLBACK')
+
+
+@pytest.mark.run_loop
+def test_bulk_update(cursor, table, assert_records):
+    data = [(i, "bob", 21, 123) for i in range(10)]
+    yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", data)
+    cursor.max_stmt_length = 200
+    rows = yield from cursor.executemany(
+        "UPDATE bulkinsert SET age = %s WHERE id = %s;",
+        [(30 + i, i) for i in range(10)], batch_statements=True)
+    assert 10 == rows
+    assert 10 == cursor.rowcount
+    assert cursor._last_executed.count(b';') > 0
+    yield from cursor.execute('COMMIT')
+    yield from assert_records([(i, "bob", 30 + i, 123) for i in range(10)])
+
+    # statements are not batched unless asked to
+    rows = yield from cursor.executemany(
+        "UPDATE bulkinsert SET age = %s WHERE id = %s",
+        [(40 + i, i) for i in range(10)])
+    assert 10 == rows
+    assert b';' not in cursor._last_executed
+
+
+@pytest.mark.run_loop
+def test_bulk_update_trailing_comment(cursor, table, assert_records):
+    data = [(i, "bob", 21, 123) for i in range(10)]
+    yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", data)
+    cursor.max_stmt_length = 200
+    rows = yield from cursor.executemany(
+        "UPDATE bulkinsert SET age = %s WHERE id = %s -- set age",
+        [(30 + i, i) for i in range(10)], batch_statements=True)
+    assert 10 == rows
+    yield from cursor.execute('COMMIT')
+    yield from assert_records([(i, "bob", 30 + i, 123) for i in range(10)])
+
+
+@pytest.mark.run_loop
+def test_bulk_delete_pipelined(cursor, table, assert_records):
+    data = [(i, "bob", 21, 123) for i in range(10)]
+    yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", data)
+    cursor.max_stmt_length = 100
+    rows = yield from cursor.executemany(
+        "DELETE FROM bulkinsert WHERE id = %s", range(5), pipeline=2,
+        batch_statements=True)
+    assert 5 == rows
+    yield from cursor.execute('COMMIT')
+    yield from assert_records(data[5:])
+
+
+@pytest.mark.run_loop
+def test_bulk_insert_mixed_types(cursor, table, assert_records):
+    data = [(0, "bob", 21, None), (1, None, 56.0, 45), (2, "fred", 100, 180)]
+    cursor.max_stmt_length = 60
+    rows = yield from cursor.executemany(
+        "INSERT INTO bulkinsert (id, name, age, height) "
+        "VALUES (%s,%s,%s,%s)", data)
+    assert 3 == rows
+    assert bytearray(b"INSERT INTO bulkinsert (id, name, age, height) "
+                     b"VALUES (2,'fred',100,180)") == cursor._last_executed
+    yield from cursor.execute('COMMIT')
+    yield from assert_records([(0, "bob", 21, None), (1, None, 56, 45),
+                               (2, "fred", 100, 180)])
@@ -0,0 +1,84 @@
+import asyncio
+from array import array
+
+import pytest
+from aiomysql import ColumnarCursor
+
+
+@pytest.fixture
+def table(loop, connection, table_cleanup):
+    @asyncio.coroutine
+    def f():
+        cursor = yield from connection.cursor()
+        yield from cursor.execute("DROP TABLE IF EXISTS columnar;")
+        yield from cursor.execute(
+            "CREATE TABLE columnar (id INT, big BIGINT UNSIGNED, "
+            "price DOUBLE, name VARCHAR(20), data BLOB)")
+        yield from cursor.executemany(
+            "INSERT INTO columnar VALUES (%s, %s, %s, %s, %s)",
+            [(1, 2 ** 64 - 1, 1.5, 'a', b'\x00\x01'),
+             (2, 0, 2.5, 'b', b''),
+             (3, None, None, None, None)])
+        yield from cursor.close()
+    table_cleanup('columnar')
+    loop.run_until_complete(f())
+
+
+@pytest.mark.run_loop
+def test_fetchcolumns(connection, table):
+    cursor = yield from connection.cursor(ColumnarCursor)
+    yield from cursor.execute(
+        "SELECT id, big, price, name, data FROM columnar ORDER BY id")
+    columns = yield from cursor.fetchcolumns()
+    assert array('i', [1, 2, 3]) == columns['id']
+    assert array('Q', [2 ** 64 - 1, 0, 0]) == columns['big']
+    assert array('d', [1.5, 2.5, 0]) == columns['price']
+    assert ['a', 'b', None] == columns['name']
+    assert [b'\x00\x01', b'', b''] == list(columns['data'])
+    assert bytearray(b'\x00\x00\x01') == cursor.null_masks['big']
+    assert 'id' not in cursor.null_masks
+    assert 3 == cursor.rownumber
+
+
+@pytest.mark.run_loop
+def test_fetch_rows(connection, table):
+    cursor = yield from connection.cursor(ColumnarCursor)
+    yield from cursor.execute(
+        "SELECT id, big, price, name, data FROM columnar ORDER BY id")
+    row = yield from cursor.fetchone()
+    assert (1, 2 ** 64 - 1, 1.5, 'a', b'\x00\x01') == row
+    rows = yield from cursor.fetchall()
+    assert [(2, 0, 2.5, 'b', b''), (3, None, None, None, None)] == rows
+
+    yield from cursor.execute("UPDATE columnar SET id = id")
+    assert {} == (yield from cursor.fetchcolumns())
+
+
+@pytest.mark.run_loop
+def test_fetch_numpy(connection, table):
+    numpy = pytest.importorskip('numpy')
+    cursor = yield from connection.cursor(ColumnarCursor)
+    yield from cursor.execute(
+        "SELECT id, big, price, name FROM columnar ORDER BY id")
+    arrays = yield from cursor.fetch_numpy()
+    assert numpy.int32 == arrays['id'].dtype
+    assert [1, 2, 3] == arrays['id'].tolist()
+    assert numpy.uint64 == arrays['big'].dtype
+    assert [False, False, True] == arrays['big'].mask.tolist()
+    assert numpy.float64 == arrays['price'].dtype
+    assert object == arrays['name'].dtype
+
+
+@pytest.mark.run_loop
+def test_fetch_structured(connection, table):
+    pytest.importorskip('numpy')
+    cursor = yield from connection.cursor(ColumnarCursor)
+    yield from cursor.execute(
+        "SELECT id, price FROM columnar ORDER BY id")
+    result = yield from cursor.fetch_structured()
+    assert ('id', 'price') == result.dtype.names
+    assert [1, 2, 3] == result['id'].tolist()
+    assert [False, False, True] == result['price'].mask.tolist()
+
+    yield from cursor.execute("UPDATE columnar SET id = id")
+    assert (yield from cursor.fetch_structured()) is None
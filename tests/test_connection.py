@@ -255,3 +255,68 @@ class TestConnection(AIOPyMySQLTestCase):
         yield from cur.execute("SELECT 3;")
         resp = yield from cur.fetchone()
         self.assertEqual(resp[0], 3)
+
+    @run_until_complete
+    def test_large_query(self):
+        conn = yield from self.connect()
+        cur = yield from conn.cursor()
+        value = 'x' * (conn.write_join_threshold * 4)
+        yield from cur.execute(b"SELECT '" + value.encode() + b"'")
+        resp = yield from cur.fetchone()
+        self.assertEqual(resp[0], value)
+
+    @run_until_complete
+    def test_kill_on_cancel(self):
+        conn = yield from self.connect(kill_on_cancel=True)
+        cur = yield from conn.cursor()
+        with self.assertRaises(asyncio.TimeoutError):
+            yield from asyncio.wait_for(cur.execute("SELECT SLEEP(10)"),
+                                        0.1, loop=self.loop)
+        self.assertFalse(conn.closed)
+        yield from cur.execute("SELECT 3")
+        resp = yield from cur.fetchone()
+        self.assertEqual(resp[0], 3)
+
+    @run_until_complete
+    def test_kill_on_cancel_pool(self):
+        pool = yield from self.create_pool(minsize=1)
+        conn = yield from self.connect(kill_on_cancel=pool)
+        cur = yield from conn.cursor()
+        with self.assertRaises(asyncio.TimeoutError):
+            yield from asyncio.wait_for(cur.execute("SELECT SLEEP(10)"),
+                                        0.1, loop=self.loop)
+        yield from cur.execute("SELECT 3")
+        resp = yield from cur.fetchone()
+        self.assertEqual(resp[0], 3)
+        self.assertFalse(conn.closed)
+        # the side connection is back in the pool
+        self.assertEqual(1, pool.freesize)
+
+    @run_until_complete
+    def test_kill_on_cancel_failure(self):
+        pool = yield from self.create_pool(minsize=0)
+        pool.close()
+        yield from pool.wait_closed()
+        conn = yield from self.connect(kill_on_cancel=pool)
+        cur = yield from conn.cursor()
+        with self.assertRaises(asyncio.TimeoutError):
+            yield from asyncio.wait_for(cur.execute("SELECT SLEEP(10)"),
+                                        0.1, loop=self.loop)
+        # the query cannot be killed, the connection is closed instead
+        with self.assertRaises(aiomysql.InterfaceError):
+            yield from cur.execute("SELECT 3")
+        self.assertTrue(conn.closed)
+
+    @run_until_complete
+    def test_kill_on_cancel_pipelined(self):
+        conn = yield from self.connect(kill_on_cancel=True)
+        cur = yield from conn.cursor()
+        with self.assertRaises(asyncio.TimeoutError):
+            yield from asyncio.wait_for(
+                cur.executemany("SELECT SLEEP(%s)", [(10,), (0,), (0,)],
+                                pipeline=3),
+                0.1, loop=self.loop)
+        # statements sent after the killed one are not waited for
+        with self.assertRaises(aiomysql.InterfaceError):
+            yield from cur.execute("SELECT 3")
+        self.assertTrue(conn.closed)
@@ -0,0 +1,61 @@
+import datetime
+import pickle
+from decimal import Decimal
+
+import pytest
+from pymysql import converters as pymysql_converters
+from pymysql.constants import FIELD_TYPE
+
+from aiomysql import converters
+
+
+@pytest.mark.parametrize('value', [
+    '2016-01-02 03:04:05', '2016-01-02 03:04:05.123456',
+    '2016-01-02 03:04:05.5', b'2016-01-02 03:04:05',
+    '0000-00-00 00:00:00', '2016-02-31 00:00:00', '2016-01-02'])
+def test_convert_datetime(value):
+    expected = pymysql_converters.convert_datetime(value)
+    assert expected == converters.convert_datetime(value)
+
+
+@pytest.mark.parametrize('value', [
+    '2016-01-02', b'2016-12-31', '0000-00-00', '2016-1-2'])
+def test_convert_date(value):
+    expected = pymysql_converters.convert_date(value)
+    assert expected == converters.convert_date(value)
+
+
+@pytest.mark.parametrize('value', [
+    '25:06:17', '-25:06:17', '838:59:59.5', '00:00:01.000001',
+    '-00:00:00.5', b'01:02:03', 'random crap'])
+def test_convert_timedelta(value):
+    expected = pymysql_converters.convert_timedelta(value)
+    assert expected == converters.convert_timedelta(value)
+
+
+def test_convert_mysql_timestamp():
+    assert datetime.datetime(2007, 2, 25, 22, 32, 17) == \
+        converters.convert_mysql_timestamp('2007-02-25 22:32:17')
+    assert datetime.datetime(2007, 2, 25, 22, 32, 17) == \
+        converters.convert_mysql_timestamp('20070225223217')
+
+
+def test_convert_decimal():
+    assert Decimal('1.50') == converters.convert_decimal(b'1.50')
+    assert Decimal('1.50') == converters.convert_decimal('1.50')
+
+
+def test_date_cache():
+    decoders = converters.make_decoders(date_cache_size=10)
+    convert = decoders[FIELD_TYPE.DATE]
+    assert convert('2016-01-02') is convert('2016-01-02')
+    assert converters.convert_datetime is \
+        decoders[FIELD_TYPE.DATETIME]
+
+
+def test_date_cache_pickle():
+    # decoders are sent to processes of a decode_executor pool
+    decoders = converters.make_decoders(date_cache_size=10)
+    convert = pickle.loads(pickle.dumps(decoders[FIELD_TYPE.DATE]))
+    assert datetime.date(2016, 1, 2) == convert('2016-01-02')
+    assert convert('2016-01-02') is convert('2016-01-02')
@@ -205,6 +205,21 @@ class TestCursor(base.AIOPyMySQLTestCase):
         ret = yield from cur.fetchall()
         self.assertEqual(((2, 'b'), (3, 'c')), ret)
 
+    @run_until_complete
+    def test_fetch_nowait(self):
+        conn = self.connections[0]
+        yield from self._prepare(conn)
+        cur = yield from conn.cursor()
+        yield from cur.execute('SELECT * FROM tbl;')
+        self.assertEqual((1, 'a'), cur.fetchone_nowait())
+        self.assertEqual(((2, 'b'),), cur.fetchmany_nowait())
+        self.assertEqual(((3, 'c'),), cur.fetchall_nowait())
+        self.assertIsNone(cur.fetchone_nowait())
+
+        yield from cur.execute('SELECT * FROM tbl;')
+        yield from cur.scroll(1)
+        self.assertEqual([(2, 'b'), (3, 'c')], [row for row in cur])
+
     @run_until_complete
     def test_aggregates(self):
         """ test aggregate functions """
@@ -0,0 +1,24 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+
+SQL = "SELECT %s AS n, NOW() AS ts, 1.5 AS dec_value FROM DUAL" + \
+    " UNION ALL SELECT %s, NOW(), 1.5 FROM DUAL" * 99
+
+
+@pytest.mark.run_loop
+@pytest.mark.parametrize('executor_class',
+                         [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_decode_executor(connection_creator, executor_class):
+    executor = executor_class(2)
+    conn = yield from connection_creator(decode_executor=executor,
+                                         decode_offload_bytes=500)
+    try:
+        cur = yield from conn.cursor()
+        yield from cur.execute(SQL, list(range(100)))
+        rows = yield from cur.fetchall()
+        assert list(range(100)) == [r[0] for r in rows]
+        assert 100 == cur.rowcount
+    finally:
+        executor.shutdown()
@@ -2,6 +2,7 @@ import asyncio
 import datetime
 
 import aiomysql.cursors
+from aiomysql.rows import DictRow
 from tests import base
 from tests._testutils import run_until_complete
 
@@ -117,3 +118,17 @@ class TestDictCursor(base.AIOPyMySQLTestCase):
         self.assertEqual([self.bob], r,
                          "fetch a 1 row result via fetchall failed via "
                          "DictCursor")
+
+    @run_until_complete
+    def test_dict_row(self):
+        class DictRowCursor(self.cursor_type):
+            dict_type = DictRow
+
+        cur = yield from self.conn.cursor(DictRowCursor)
+        yield from cur.execute("SELECT * FROM dictcursor")
+        r = yield from cur.fetchall()
+        self.assertIsInstance(r[0], DictRow)
+        self.assertEqual([self.bob, self.jim, self.fred], r)
+        self.assertEqual(21, r[0]['age'])
+        self.assertEqual(self.bob, dict(r[0]))
+        self.assertIs(r[0]._keys, r[1]._keys)
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from aiomysql import GroupCommitter, IntegrityError
+
+
+@pytest.fixture
+def table(loop, connection, table_cleanup):
+    @asyncio.coroutine
+    def f():
+        cursor = yield from connection.cursor()
+        yield from cursor.execute("DROP TABLE IF EXISTS group_commit;")
+        yield from cursor.execute("CREATE TABLE group_commit "
+                                  "(id INT, PRIMARY KEY (id))")
+        yield from cursor.close()
+    table_cleanup('group_commit')
+    loop.run_until_complete(f())
+
+
+@asyncio.coroutine
+def insert(cur, value):
+    yield from cur.execute("INSERT INTO group_commit VALUES (%s)", value)
+    return value
+
+
+@pytest.mark.run_loop
+def test_group_commit(pool_creator, cursor, table, loop):
+    pool = yield from pool_creator(minsize=1, maxsize=1)
+    committer = GroupCommitter(pool, loop=loop)
+    futs = [committer.submit(insert, i) for i in range(10)]
+    res = yield from asyncio.gather(*futs, loop=loop)
+    assert list(range(10)) == res
+    yield from committer.close()
+
+    yield from cursor.execute("SELECT COUNT(*) FROM group_commit")
+    (count,) = yield from cursor.fetchone()
+    assert 10 == count
+
+
+@pytest.mark.run_loop
+def test_group_commit_failed_unit(pool_creator, cursor, table, loop):
+    pool = yield from pool_creator(minsize=1, maxsize=1)
+    committer = GroupCommitter(pool, loop=loop)
+    fut1 = committer.submit(insert, 1)
+    # duplicate key, only this unit should be rolled back
+    fut2 = committer.submit(insert, 1)
+    fut3 = committer.submit(insert, 3)
+    yield from asyncio.wait([fut1, fut2, fut3], loop=loop)
+    assert 1 == fut1.result()
+    assert isinstance(fut2.exception(), IntegrityError)
+    assert 3 == fut3.result()
+    yield from committer.close()
+
+    yield from cursor.execute("SELECT id FROM group_commit ORDER BY id")
+    rows = yield from cursor.fetchall()
+    assert [(1,), (3,)] == list(rows)
+
+
+@pytest.mark.run_loop
+def test_group_commit_closed(pool_creator, loop):
+    pool = yield from pool_creator(minsize=1, maxsize=1)
+    committer = GroupCommitter(pool, loop=loop)
+    yield from committer.close()
+    with pytest.raises(RuntimeError):
+        committer.submit(insert, 1)
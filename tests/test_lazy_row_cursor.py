@@ -0,0 +1,38 @@
+import asyncio
+import datetime
+
+import pytest
+from aiomysql import LazyRowCursor
+
+
+@pytest.fixture
+def table(loop, connection, table_cleanup):
+    @asyncio.coroutine
+    def f():
+        cursor = yield from connection.cursor()
+        yield from cursor.execute("DROP TABLE IF EXISTS lazy_rows;")
+        yield from cursor.execute(
+            "CREATE TABLE lazy_rows (id INT, name VARCHAR(20), "
+            "created DATETIME, body TEXT)")
+        yield from cursor.executemany(
+            "INSERT INTO lazy_rows VALUES (%s, %s, %s, %s)",
+            [(1, 'a', datetime.datetime(2016, 1, 2, 3, 4, 5), 'x' * 1000),
+             (2, None, None, None)])
+        yield from cursor.close()
+    table_cleanup('lazy_rows')
+    loop.run_until_complete(f())
+
+
+@pytest.mark.run_loop
+def test_lazy_rows(connection, table):
+    cursor = yield from connection.cursor(LazyRowCursor)
+    yield from cursor.execute("SELECT * FROM lazy_rows ORDER BY id")
+    row = yield from cursor.fetchone()
+    assert 'a' == row[1]
+    assert 4 == len(row)
+    assert 'x' * 1000 == row[-1]
+    assert (1, 'a', datetime.datetime(2016, 1, 2, 3, 4, 5),
+            'x' * 1000) == tuple(row)
+    rows = yield from cursor.fetchall()
+    assert ((2, None, None, None),) == rows
+    assert (None, None) == rows[0][2:]
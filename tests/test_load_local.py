@@ -4,7 +4,8 @@ import os
 from unittest.mock import patch, MagicMock
 
 import pytest
-from pymysql.err import OperationalError
+from pymysql.err import OperationalError, ProgrammingError
+from aiomysql.connection import LoadLocalFile
 
 
 @pytest.yield_fixture
@@ -69,6 +70,37 @@ def test_load_file(cursor, table_local_file):
     assert 22749 == resp[0]
 
 
+@pytest.mark.run_loop
+def test_load_file_small_chunks(cursor, table_local_file):
+    # file is sent in many packets, each one drained before the next
+    filename = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'fixtures',
+                            'load_local_data.txt')
+    with patch.object(LoadLocalFile, 'chunk_size', 4096):
+        yield from cursor.execute(
+            ("LOAD DATA LOCAL INFILE '{0}' INTO TABLE " +
+             "test_load_local FIELDS TERMINATED BY ','").format(filename)
+        )
+    yield from cursor.execute("SELECT COUNT(*) FROM test_load_local")
+    resp = yield from cursor.fetchone()
+    assert 22749 == resp[0]
+
+
+@pytest.mark.run_loop
+def test_load_file_without_mmap(cursor, table_local_file):
+    filename = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'fixtures',
+                            'load_local_data.txt')
+    with patch.object(LoadLocalFile, 'use_mmap', False):
+        yield from cursor.execute(
+            ("LOAD DATA LOCAL INFILE '{0}' INTO TABLE " +
+             "test_load_local FIELDS TERMINATED BY ','").format(filename)
+        )
+    yield from cursor.execute("SELECT COUNT(*) FROM test_load_local")
+    resp = yield from cursor.fetchone()
+    assert 22749 == resp[0]
+
+
 @pytest.mark.run_loop
 def test_load_warnings(cursor, table_local_file):
     # Test load local infile produces the appropriate warnings
@@ -84,3 +116,46 @@ def test_load_warnings(cursor, table_local_file):
     with warnings.catch_warnings(record=True) as w:
         yield from cursor.execute(sql)
     assert "Incorrect integer value" in str(w[-1].message)
+
+
+@pytest.mark.run_loop
+def test_load_rows(cursor, table_local_file):
+    data = [(i, i * 2) for i in range(1000)] + [(None, 1)]
+    rows = yield from cursor.load_rows('test_load_local', ('a', 'b'), data)
+    assert 1001 == rows
+    yield from cursor.execute("SELECT COUNT(*), SUM(b) FROM test_load_local"
+                              " WHERE a IS NOT NULL")
+    resp = yield from cursor.fetchone()
+    assert (1000, 999000) == (resp[0], int(resp[1]))
+    yield from cursor.execute("SELECT b FROM test_load_local WHERE a IS NULL")
+    assert (1,) == (yield from cursor.fetchone())
+
+
+@pytest.mark.run_loop
+def test_load_rows_from_generator(cursor, table_local_file):
+    rows = yield from cursor.load_rows('test_load_local', ('a', 'b'),
+                                       ((i, i) for i in range(10)))
+    assert 10 == rows
+    assert not cursor.connection._local_infile_rows
+
+
+@pytest.mark.run_loop
+def test_load_rows_escaping(cursor, table_cleanup):
+    yield from cursor.execute("CREATE TABLE test_load_rows_text "
+                              "(a INTEGER, b TEXT)")
+    table_cleanup('test_load_rows_text')
+    data = [(1, 'tab\there'), (2, 'new\nline'), (3, 'back\\slash'),
+            (4, '\\N'), (5, None)]
+    yield from cursor.load_rows('test_load_rows_text', ('a', 'b'), data)
+    yield from cursor.execute("SELECT a, b FROM test_load_rows_text "
+                              "ORDER BY a")
+    resp = yield from cursor.fetchall()
+    assert data == list(resp)
+
+
+@pytest.mark.run_loop
+def test_load_rows_requires_local_infile(connection_creator):
+    conn = yield from connection_creator(local_infile=False)
+    cursor = yield from conn.cursor()
+    with pytest.raises(ProgrammingError):
+        yield from cursor.load_rows('test_load_local', ('a', 'b'), [(1, 2)])
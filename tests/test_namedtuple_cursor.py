@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from aiomysql import NamedTupleCursor, SSNamedTupleCursor
+
+
+@pytest.fixture
+def table(loop, connection, table_cleanup):
+    @asyncio.coroutine
+    def f():
+        cursor = yield from connection.cursor()
+        yield from cursor.execute("DROP TABLE IF EXISTS namedtuples;")
+        yield from cursor.execute(
+            "CREATE TABLE namedtuples (id INT, name VARCHAR(20))")
+        yield from cursor.execute(
+            "INSERT INTO namedtuples VALUES (1, 'a'), (2, 'b')")
+        yield from cursor.close()
+    table_cleanup('namedtuples')
+    loop.run_until_complete(f())
+
+
+@pytest.mark.run_loop
+@pytest.mark.parametrize('cursor_class',
+                         [NamedTupleCursor, SSNamedTupleCursor])
+def test_namedtuple_rows(connection, table, cursor_class):
+    cursor = yield from connection.cursor(cursor_class)
+    yield from cursor.execute(
+        "SELECT id, name, COUNT(*) FROM namedtuples "
+        "GROUP BY id, name ORDER BY id")
+    row = yield from cursor.fetchone()
+    assert (1, 'a', 1) == row
+    assert 1 == row.id
+    assert 'a' == row.name
+    assert 1 == row._2
+    rows = yield from cursor.fetchall()
+    assert [(2, 'b', 1)] == list(rows)
+    assert type(row) is type(rows[0])
+    yield from cursor.close()
+
+
+@pytest.mark.run_loop
+def test_namedtuple_class_cached(connection, table):
+    cursor = yield from connection.cursor(NamedTupleCursor)
+    yield from cursor.execute("SELECT id FROM namedtuples")
+    first = yield from cursor.fetchone()
+    yield from cursor.execute("SELECT id FROM namedtuples")
+    second = yield from cursor.fetchone()
+    assert type(first) is type(second)
@@ -0,0 +1,183 @@
+import asyncio
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from aiomysql import PreparedCursor, ProgrammingError, SSPreparedCursor
+
+
+@pytest.fixture
+def table(loop, connection, table_cleanup):
+    @asyncio.coroutine
+    def f():
+        cursor = yield from connection.cursor()
+        yield from cursor.execute("DROP TABLE IF EXISTS prepared;")
+        yield from cursor.execute(
+            "CREATE TABLE prepared (id INT, big BIGINT UNSIGNED, "
+            "price FLOAT, amount DECIMAL(10, 2), name VARCHAR(20), "
+            "created DATETIME(6), day DATE, duration TIME, data LONGBLOB)")
+        yield from cursor.close()
+    table_cleanup('prepared')
+    loop.run_until_complete(f())
+
+
+@pytest.mark.run_loop
+def test_prepared_roundtrip(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    row = (1, 2 ** 64 - 1, 1.1, Decimal('3.50'), "a'b\\c",
+           datetime.datetime(2016, 1, 2, 3, 4, 5, 6),
+           datetime.date(2016, 1, 2), datetime.timedelta(hours=-3),
+           b'\x00\x01')
+    rows = yield from cursor.execute(
+        "INSERT INTO prepared VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        row)
+    assert 1 == rows
+    yield from cursor.execute(
+        "SELECT * FROM prepared WHERE id = %(id)s", {'id': 1})
+    assert (row,) == (yield from cursor.fetchall())
+
+    yield from cursor.execute("SELECT * FROM prepared WHERE id = %s", 2)
+    assert () == (yield from cursor.fetchall())
+    assert 2 == len(connection._statements)
+
+
+@pytest.mark.run_loop
+def test_prepared_null(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    yield from cursor.execute(
+        "INSERT INTO prepared (id, name, created) VALUES (%s, %s, %s)",
+        (1, None, None))
+    yield from cursor.execute("SELECT id, name, created FROM prepared")
+    assert (1, None, None) == (yield from cursor.fetchone())
+
+
+@pytest.mark.run_loop
+def test_prepared_zero_date(connection, table):
+    cursor = yield from connection.cursor()
+    yield from cursor.execute("SET SESSION sql_mode = ''")
+    yield from cursor.execute(
+        "INSERT INTO prepared (id, created, day) "
+        "VALUES (1, '0000-00-00', '0000-00-00')")
+    sql = "SELECT created, day FROM prepared"
+    yield from cursor.execute(sql)
+    expected = yield from cursor.fetchone()
+    # same as the text protocol gives
+    prepared = yield from connection.cursor(PreparedCursor)
+    yield from prepared.execute(sql)
+    assert expected == (yield from prepared.fetchone())
+
+
+@pytest.mark.run_loop
+def test_prepared_long_data(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    data = bytes(range(256)) * 8192
+    stmt = yield from connection.prepare(
+        "INSERT INTO prepared (id, data) VALUES (?, ?)")
+    stmt.long_data_threshold = stmt.long_data_chunk_size = 100000
+    yield from stmt.execute((1, data))
+    yield from stmt.execute((2, io.BytesIO(data)))
+    yield from stmt.close()
+    assert stmt.closed
+
+    yield from cursor.execute("SELECT id, data FROM prepared ORDER BY id")
+    assert ((1, data), (2, data)) == (yield from cursor.fetchall())
+
+
+class _FailingReader(io.BytesIO):
+
+    def read(self, size=-1):
+        if self.tell():
+            raise OSError("read failed")
+        return super().read(size)
+
+
+@pytest.mark.run_loop
+def test_prepared_long_data_failure(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    data = b'x' * 300000
+    stmt = yield from connection.prepare(
+        "INSERT INTO prepared (id, data) VALUES (?, ?)")
+    stmt.long_data_threshold = stmt.long_data_chunk_size = 100000
+    with pytest.raises(OSError):
+        yield from stmt.execute((1, _FailingReader(data)))
+    # chunks sent before the failure are not used by the next execution
+    yield from stmt.execute((2, data))
+    yield from stmt.close()
+
+    yield from cursor.execute("SELECT id, LENGTH(data) FROM prepared")
+    assert ((2, 300000),) == (yield from cursor.fetchall())
+
+
+@pytest.mark.run_loop
+def test_prepared_cursor_callproc(connection, table):
+    # CREATE PROCEDURE can not be prepared
+    ddl = yield from connection.cursor()
+    yield from ddl.execute("DROP PROCEDURE IF EXISTS prepared_proc")
+    yield from ddl.execute(
+        "CREATE PROCEDURE prepared_proc(IN x INT) "
+        "BEGIN SELECT x, 'a'; END")
+    cursor = yield from connection.cursor(PreparedCursor)
+    try:
+        yield from cursor.callproc('prepared_proc', (5,))
+        assert (5, 'a') == (yield from cursor.fetchone())
+        yield from cursor.close()
+    finally:
+        yield from ddl.execute("DROP PROCEDURE prepared_proc")
+
+
+@pytest.mark.run_loop
+def test_prepared_executemany(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    rows = yield from cursor.executemany(
+        "INSERT INTO prepared (id, name) VALUES (%s, %s)",
+        [(i, str(i)) for i in range(5)])
+    assert 5 == rows
+    yield from cursor.execute("SELECT COUNT(*) FROM prepared")
+    assert (5,) == (yield from cursor.fetchone())
+
+
+@pytest.mark.run_loop
+def test_prepared_errors(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    with pytest.raises(ProgrammingError):
+        yield from cursor.execute("SELECT %d", (1,))
+    with pytest.raises(TypeError):
+        yield from cursor.execute("SELECT %s, %s", (1,))
+    with pytest.raises(ProgrammingError):
+        yield from cursor.execute("SELECT %s", (object(),))
+    yield from cursor.execute("SELECT %s", (1,))
+    assert (1,) == (yield from cursor.fetchone())
+
+
+@pytest.mark.run_loop
+def test_server_side_cursor(connection, table):
+    cursor = yield from connection.cursor(PreparedCursor)
+    yield from cursor.executemany(
+        "INSERT INTO prepared (id, name) VALUES (%s, %s)",
+        [(i, str(i)) for i in range(50)])
+
+    cursor = yield from connection.cursor(SSPreparedCursor)
+    cursor.fetch_size = 7
+    yield from cursor.execute(
+        "SELECT id, name FROM prepared WHERE id >= %s ORDER BY id", (10,))
+    assert (10, '10') == (yield from cursor.fetchone())
+    assert [(11, '11'), (12, '12')] == (yield from cursor.fetchmany(2))
+
+    # the connection is free while rows wait on the server
+    other = yield from connection.cursor()
+    yield from other.execute("SELECT COUNT(*) FROM prepared")
+    assert (50,) == (yield from other.fetchone())
+
+    rows = yield from cursor.fetchall()
+    assert [(i, str(i)) for i in range(13, 50)] == rows
+    assert 40 == cursor.rownumber
+    assert (yield from cursor.fetchone()) is None
+
+    # abandoned scan, no rows are transferred by close
+    yield from cursor.execute(
+        "SELECT id, name FROM prepared ORDER BY id")
+    yield from cursor.fetchmany(3)
+    yield from cursor.close()
+    yield from other.execute("SELECT 1")
+    assert (1,) == (yield from other.fetchone())
@@ -184,3 +184,111 @@ class TestSSCursor(base.AIOPyMySQLTestCase):
 
         with self.assertRaises(InterfaceError):
             yield from conn.cursor(SSCursor)
+
+    @run_until_complete
+    def test_sscursor_fetchmany_batches(self):
+        conn = self.connections[0]
+        cur = yield from conn.cursor(SSCursor)
+        yield from cur.execute('DROP TABLE IF EXISTS long_seq;')
+        yield from cur.execute('CREATE TABLE long_seq (id int(11))')
+        yield from cur.executemany('INSERT INTO long_seq VALUES (%s)',
+                                   range(5000))
+        yield from conn.commit()
+
+        yield from cur.execute('SELECT id FROM long_seq ORDER BY id')
+        rows = yield from cur.fetchmany(3000)
+        self.assertEqual([(i,) for i in range(3000)], rows)
+        self.assertEqual(3000, cur.rownumber)
+        rows = yield from cur.fetchmany(3000)
+        self.assertEqual([(i,) for i in range(3000, 5000)], rows)
+        self.assertEqual([], (yield from cur.fetchmany(3000)))
+
+        yield from cur.execute('SELECT id FROM long_seq ORDER BY id')
+        rows = yield from cur.fetchall()
+        self.assertEqual(5000, len(rows))
+        self.assertEqual(5000, cur.rownumber)
+        yield from cur.execute('DROP TABLE long_seq')
+        yield from cur.close()
+
+    @run_until_complete
+    def test_sscursor_fetchmany_zero(self):
+        conn = self.connections[0]
+        cur = yield from conn.cursor(SSCursor)
+        yield from self._prepare(conn)
+        yield from cur.execute('SELECT * FROM tz_data')
+        self.assertEqual([], (yield from cur.fetchmany(0)))
+        self.assertEqual(0, cur.rownumber)
+        self.assertEqual(self.data[0], (yield from cur.fetchone()))
+        yield from cur.close()
+
+    @run_until_complete
+    def test_sscursor_fetchmany_plain_reader(self):
+        # readers without the private buffer of asyncio.StreamReader are
+        # read packet by packet
+        class Reader:
+            def __init__(self, reader):
+                self.readexactly = reader.readexactly
+                self.at_eof = reader.at_eof
+
+        conn = self.connections[0]
+        yield from self._prepare(conn)
+        conn._reader = Reader(conn._reader)
+        self.assertIsNone(conn._read_packet_nowait())
+        cur = yield from conn.cursor(SSCursor)
+        yield from cur.execute('SELECT * FROM tz_data')
+        self.assertEqual(self.data, (yield from cur.fetchmany(100)))
+        yield from cur.close()
+
+    @run_until_complete
+    def test_sscursor_nowait_not_supported(self):
+        conn = self.connections[0]
+        cur = yield from conn.cursor(SSCursor)
+        yield from self._prepare(conn)
+        yield from cur.execute('SELECT * FROM tz_data')
+        with self.assertRaises(NotSupportedError):
+            cur.fetchone_nowait()
+        with self.assertRaises(NotSupportedError):
+            iter(cur)
+        yield from cur.close()
+
+    @run_until_complete
+    def test_sscursor_stream_column(self):
+        conn = self.connections[0]
+        cur = yield from conn.cursor(SSCursor)
+        yield from cur.execute('DROP TABLE IF EXISTS blobs')
+        yield from cur.execute('CREATE TABLE blobs (id INT, data LONGBLOB, '
+                               'name VARCHAR(10))')
+        data = bytes(range(256)) * 4096
+        yield from cur.executemany('INSERT INTO blobs VALUES (%s, %s, %s)',
+                                   [(1, data, 'a'), (2, None, 'b'),
+                                    (3, data, 'c'), (4, b'x', 'd')])
+        yield from conn.commit()
+
+        yield from cur.execute('SELECT * FROM blobs ORDER BY id')
+        stream = yield from cur.stream_column('data', chunk_size=10000)
+        self.assertEqual(len(data), stream.length)
+        self.assertIsNone(stream.row)
+        chunks = []
+        while True:
+            chunk = yield from stream.read_chunk()
+            if not chunk:
+                break
+            self.assertLessEqual(len(chunk), 10000)
+            chunks.append(chunk)
+        self.assertEqual(data, b''.join(chunks))
+        self.assertEqual((1, None, 'a'), stream.row)
+
+        stream = yield from cur.stream_column(1)
+        self.assertIsNone(stream.length)
+        self.assertEqual(b'', (yield from stream.read_chunk()))
+        self.assertEqual((2, None, 'b'), stream.row)
+
+        # partly read value is skipped by the next fetch
+        stream = yield from cur.stream_column(1)
+        yield from stream.read_chunk()
+        self.assertEqual((4, b'x', 'd'), (yield from cur.fetchone()))
+        self.assertIsNone((yield from cur.stream_column(1)))
+        self.assertEqual(4, cur.rownumber)
+
+        yield from cur.execute('DROP TABLE blobs')
+        yield from cur.close()
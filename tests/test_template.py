@@ -0,0 +1,83 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+
+VALUES = [1, 1.5, "a'b\\c", b"\x00'", None, True, Decimal('1.10'),
+          datetime.datetime(2016, 1, 2, 3, 4, 5), datetime.date(2016, 1, 2),
+          datetime.timedelta(hours=-3), (1, 'a'), [2, None]]
+
+
+@pytest.mark.run_loop
+def test_template_same_as_format(connection):
+    cur = yield from connection.cursor()
+    template = connection.compile("SELECT %s, '%%'")
+    for value in VALUES + VALUES:
+        expected = "SELECT %s, '%%'" % cur._escape_args((value,), connection)
+        assert expected == template.render((value,), connection)
+
+
+@pytest.mark.run_loop
+def test_template_named(connection):
+    template = connection.compile("SELECT %(a)s, %(b)s, %(a)s")
+    assert "SELECT 'x', NULL, 'x'" == template.render(
+        {'a': 'x', 'b': None, 'c': 1}, connection)
+    with pytest.raises(KeyError):
+        template.render({'a': 1}, connection)
+    with pytest.raises(TypeError):
+        template.render((1, 2), connection)
+
+
+@pytest.mark.run_loop
+def test_template_fallback(connection):
+    assert "SELECT 5" == connection.compile("SELECT %d").render(
+        (5,), connection)
+    with pytest.raises(TypeError):
+        connection.compile("SELECT %s, %s").render((1,), connection)
+
+
+@pytest.mark.run_loop
+def test_template_cache(connection):
+    template = connection.compile("SELECT %s")
+    assert template is connection.compile("SELECT %s")
+    assert "SELECT %s" == template.sql
+
+
+@pytest.mark.run_loop
+def test_template_cache_lru(connection):
+    connection._templates.clear()
+    connection.template_cache_size = 2
+    first = connection.compile("SELECT %s")
+    connection.compile("SELECT %s, %s")
+    assert first is connection.compile("SELECT %s")
+    connection.compile("SELECT %s, %s, %s")
+    # least recently used template is evicted
+    assert first is connection.compile("SELECT %s")
+    assert "SELECT %s, %s" not in connection._templates
+
+
+@pytest.mark.run_loop
+def test_execute_uses_template(connection):
+    cur = yield from connection.cursor()
+    yield from cur.execute("SELECT %s, %s", (1, 'a'))
+    assert (1, 'a') == (yield from cur.fetchone())
+    assert "SELECT %s, %s" in connection._templates
+
+
+@pytest.mark.run_loop
+def test_template_render_into(connection):
+    template = connection.compile("(%s, %s)")
+    buf = bytearray()
+    # escapers are picked from the first row, other types still work
+    for value in VALUES:
+        template.render_into(buf, (1, value), connection, 'utf8')
+    expected = ''.join(template.render((1, value), connection)
+                       for value in VALUES)
+    assert expected.encode('utf8') == buf
+
+    template = connection.compile("(%(a)s)")
+    buf = bytearray()
+    template.render_into(buf, {'a': 'x'}, connection, 'utf8')
+    template.render_into(buf, {'a': 2}, connection, 'utf8')
+    assert bytearray(b"('x')(2)") == buf